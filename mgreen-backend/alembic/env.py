@@ -5,7 +5,7 @@ from users.models import Users, UserType, UserRegistration
 from plants.models import Plants, PlantsType
 from integration.models import TelegramIntegration
 from seedbeds.models import Seedbeds
-from records.models import Records
+from records.models import Records, RecordJob, SeedbedSummary, RecordRollup
 from core.config import settings
 import sys
 sys.path.append('.')  
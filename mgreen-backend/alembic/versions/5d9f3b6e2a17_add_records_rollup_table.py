@@ -0,0 +1,46 @@
+"""add records rollup table
+
+Revision ID: 5d9f3b6e2a17
+Revises: e7a2c5d8b1f4
+Create Date: 2026-10-18 17:12:09.448153
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d9f3b6e2a17'
+down_revision: Union[str, None] = 'e7a2c5d8b1f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SENSORS = ['water_temperature', 'air_temperature', 'air_humidity', 'light_level', 'height_plant']
+
+
+def upgrade() -> None:
+    sensor_columns = []
+    for sensor in SENSORS:
+        sensor_columns += [
+            sa.Column(f'{sensor}_sum', sa.Float(), nullable=True),
+            sa.Column(f'{sensor}_min', sa.Float(), nullable=True),
+            sa.Column(f'{sensor}_max', sa.Float(), nullable=True),
+        ]
+
+    op.create_table('records_rollup',
+    sa.Column('seedbed_id', sa.Integer(), nullable=False),
+    sa.Column('granularity', sa.String(length=8), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('record_count', sa.Integer(), nullable=False),
+    sa.Column('height_plant_count', sa.Integer(), nullable=False),
+    *sensor_columns,
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['seedbed_id'], ['seedbeds.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('seedbed_id', 'granularity', 'bucket_start')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('records_rollup')
@@ -0,0 +1,69 @@
+"""add seedbed summaries table
+
+Revision ID: 7b2e4d91c0a5
+Revises: 3f1a9c2d7b84
+Create Date: 2026-10-18 12:40:07.392118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e4d91c0a5'
+down_revision: Union[str, None] = '3f1a9c2d7b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SENSORS = ['water_temperature', 'air_temperature', 'air_humidity', 'light_level', 'height_plant']
+
+
+def upgrade() -> None:
+    sensor_columns = []
+    for sensor in SENSORS:
+        sensor_columns += [
+            sa.Column(f'{sensor}_sum', sa.Float(), nullable=False),
+            sa.Column(f'{sensor}_sumsq', sa.Float(), nullable=False),
+            sa.Column(f'{sensor}_last', sa.Float(), nullable=True),
+        ]
+
+    op.create_table('seedbed_summaries',
+    sa.Column('seedbed_id', sa.Integer(), nullable=False),
+    sa.Column('record_count', sa.Integer(), nullable=False),
+    sa.Column('height_plant_count', sa.Integer(), nullable=False),
+    *sensor_columns,
+    sa.Column('last_record_id', sa.Integer(), nullable=True),
+    sa.Column('last_record_at', sa.DateTime(), nullable=True),
+    sa.Column('last_analysis', sa.Text(), nullable=True),
+    sa.Column('last_analysis_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['seedbed_id'], ['seedbeds.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('seedbed_id')
+    )
+
+    # Backfill from the existing records.
+    sums = ", ".join(
+        f'coalesce(sum(r.{s}), 0), coalesce(sum(r.{s} * r.{s}), 0), last.{s}' for s in SENSORS
+    )
+    columns = ", ".join(f'{s}_sum, {s}_sumsq, {s}_last' for s in SENSORS)
+    op.execute(f'''
+        INSERT INTO seedbed_summaries (
+            seedbed_id, record_count, height_plant_count, {columns},
+            last_record_id, last_record_at, updated_at
+        )
+        SELECT r."soilId", count(*), count(r.height_plant), {sums},
+               last.id, last.created_at, now()
+        FROM records r
+        JOIN (
+            SELECT DISTINCT ON ("soilId") *
+            FROM records
+            ORDER BY "soilId", created_at DESC, id DESC
+        ) last ON last."soilId" = r."soilId"
+        GROUP BY r."soilId", {", ".join(f"last.{s}" for s in SENSORS)}, last.id, last.created_at
+    ''')
+
+
+def downgrade() -> None:
+    op.drop_table('seedbed_summaries')
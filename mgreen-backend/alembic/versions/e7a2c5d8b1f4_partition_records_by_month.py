@@ -0,0 +1,108 @@
+"""partition records by month
+
+Revision ID: e7a2c5d8b1f4
+Revises: c93d1b7f25e8
+Create Date: 2026-10-18 16:02:47.915308
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a2c5d8b1f4'
+down_revision: Union[str, None] = 'c93d1b7f25e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    'id, "soilId", photo_link, water_temperature, air_temperature, air_humidity, '
+    'light_level, height_plant, created_at, updated_at'
+)
+
+
+def _records_columns():
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('records_id_seq')"), nullable=False),
+        sa.Column('soilId', sa.Integer(), nullable=False),
+        sa.Column('photo_link', sa.String(length=255), nullable=True),
+        sa.Column('water_temperature', sa.Float(), nullable=False),
+        sa.Column('air_temperature', sa.Float(), nullable=False),
+        sa.Column('air_humidity', sa.Float(), nullable=False),
+        sa.Column('light_level', sa.Float(), nullable=False),
+        sa.Column('height_plant', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['soilId'], ['seedbeds.id'], ondelete='CASCADE'),
+    ]
+
+
+def _rename_old_table(suffix: str) -> None:
+    op.execute(f"ALTER TABLE records RENAME TO records_{suffix}")
+    op.execute(f"ALTER INDEX records_pkey RENAME TO records_{suffix}_pkey")
+    op.execute(f"ALTER INDEX ix_records_id RENAME TO ix_records_{suffix}_id")
+    op.execute(
+        f'ALTER INDEX "ix_records_soilId_created_at_id" RENAME TO "ix_records_{suffix}_soilId_created_at_id"'
+    )
+    # The sequence must outlive the old table, ids keep counting from where they are.
+    op.execute("ALTER SEQUENCE records_id_seq OWNED BY NONE")
+
+
+def _create_indexes() -> None:
+    op.create_index(op.f('ix_records_id'), 'records', ['id'], unique=False)
+    op.create_index('ix_records_soilId_created_at_id', 'records', ['soilId', 'created_at', 'id'], unique=False)
+
+
+def upgrade() -> None:
+    _rename_old_table('legacy')
+
+    op.create_table('records',
+    *_records_columns(),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    _create_indexes()
+
+    # Monthly partitions from the oldest record up to MONTHS_AHEAD ahead, plus a
+    # default partition so an insert never fails on a missing month.
+    op.execute(f"""
+    DO $$
+    DECLARE
+        month_start timestamp;
+        last_month timestamp := date_trunc('month', now()) + interval '{MONTHS_AHEAD} months';
+    BEGIN
+        SELECT date_trunc('month', coalesce(min(created_at), now())) INTO month_start FROM records_legacy;
+        WHILE month_start <= last_month LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF records FOR VALUES FROM (%L) TO (%L)',
+                'records_p' || to_char(month_start, 'YYYYMM'),
+                month_start,
+                month_start + interval '1 month'
+            );
+            month_start := month_start + interval '1 month';
+        END LOOP;
+    END $$;
+    """)
+    op.execute("CREATE TABLE records_default PARTITION OF records DEFAULT")
+
+    op.execute(f"INSERT INTO records ({COLUMNS}) SELECT {COLUMNS} FROM records_legacy")
+    op.drop_table('records_legacy')
+    op.execute("ALTER SEQUENCE records_id_seq OWNED BY records.id")
+
+
+def downgrade() -> None:
+    _rename_old_table('partitioned')
+
+    op.create_table('records',
+    *_records_columns(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_indexes()
+
+    op.execute(f"INSERT INTO records ({COLUMNS}) SELECT {COLUMNS} FROM records_partitioned")
+    op.drop_table('records_partitioned')
+    op.execute("ALTER SEQUENCE records_id_seq OWNED BY records.id")
@@ -0,0 +1,93 @@
+from dataclasses import asdict, dataclass
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+from core.config import settings
+from utils.cache import create_cache
+from utils.metrics import metrics
+
+
+@dataclass
+class Identity:
+    """What authenticated requests need to know about the caller; no password hash."""
+    id: str
+    email: str
+    username: str
+    is_active: bool
+    is_superuser: bool
+    user_type_id: Optional[str]
+    user_type: Optional[str]
+
+
+identity_cache = create_cache(
+    "identity", settings.IDENTITY_CACHE_TTL_SECONDS, settings.IDENTITY_CACHE_MAX_SIZE
+)
+
+
+async def load_identity(db: AsyncSession, user_id: str) -> Optional[Identity]:
+    """User and user type name in one round trip."""
+    result = await db.execute(
+        text(
+            "SELECT u.id, u.email, u.username, u.is_active, u.is_superuser, u.user_type_id, t.user_type "
+            "FROM users u LEFT JOIN user_type t ON t.id = u.user_type_id "
+            "WHERE u.id = :id"
+        ),
+        {"id": user_id},
+    )
+    row = result.fetchone()
+    if not row:
+        return None
+    return Identity(
+        id=str(row[0]),
+        email=row[1],
+        username=row[2],
+        is_active=row[3],
+        is_superuser=row[4],
+        user_type_id=str(row[5]) if row[5] else None,
+        user_type=row[6],
+    )
+
+
+async def get_identity(db: AsyncSession, user_id: str) -> Optional[Identity]:
+    """Identity for a token `sub`, cached for IDENTITY_CACHE_TTL_SECONDS."""
+    cached = await identity_cache.get(user_id)
+    if cached is not None:
+        metrics.incr("identity_cache.hit")
+        return Identity(**cached)
+
+    metrics.incr("identity_cache.miss")
+    identity = await load_identity(db, user_id)
+    if identity:
+        await identity_cache.set(user_id, asdict(identity))
+    return identity
+
+
+async def invalidate_identity(user_id: str):
+    """Call whenever a user is deactivated, changes role or is deleted."""
+    await identity_cache.delete(str(user_id))
+
+
+def identity_claims(identity: Identity) -> dict:
+    """Claims embedded into access tokens when AUTH_EMBED_IDENTITY_CLAIMS is on."""
+    return {
+        "email": identity.email,
+        "username": identity.username,
+        "active": identity.is_active,
+        "su": identity.is_superuser,
+        "role": identity.user_type,
+        "role_id": identity.user_type_id,
+    }
+
+
+def identity_from_claims(payload: dict) -> Optional[Identity]:
+    if not settings.AUTH_EMBED_IDENTITY_CLAIMS or "role" not in payload or "active" not in payload:
+        return None
+    return Identity(
+        id=payload["sub"],
+        email=payload.get("email"),
+        username=payload.get("username"),
+        is_active=payload["active"],
+        is_superuser=payload.get("su", False),
+        user_type_id=payload.get("role_id"),
+        user_type=payload["role"],
+    )
@@ -6,6 +6,7 @@ from .services import AuthService, get_auth_service
 from users.schemas import UserCreate, UserLogin
 from database import get_db
 from users.models import Users
+from .identity import Identity
 from utils.token import get_token
 
 router = APIRouter(
@@ -48,7 +49,7 @@ async def get_me(
     token: str = Depends(get_token),  
     auth_service: AuthService = Depends(get_auth_service),
 ):
-    current_user: Users = await auth_service.get_current_user(token)  
+    current_user: Identity = await auth_service.get_current_user(token)  
     return {
         "email": current_user.email,
         "username": current_user.username,
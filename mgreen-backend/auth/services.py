@@ -1,17 +1,17 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import text
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
 from datetime import timedelta
 from database import get_db
 from users.models import Users, UserTypeEnum
 from utils.token import create_access_token, verify_token, get_token
+from utils.password import hash_password, verify_password
 from core.config import settings
+from .identity import Identity, get_identity, identity_claims, identity_from_claims, invalidate_identity
 
 class AuthService:
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
     async def _get_user_by_email(self, email: str) -> Users:
         user_result = await self.db.execute(
@@ -59,7 +59,7 @@ class AuthService:
 
     async def authenticate_user(self, email: str, password: str) -> Users:
         user = await self._get_user_by_email(email)
-        if not self.pwd_context.verify(password, user.password):
+        if not await verify_password(password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -85,7 +85,7 @@ class AuthService:
         if not user_type:
             raise HTTPException(status_code=500, detail="User role not found")
 
-        hashed_password = self.pwd_context.hash(password)
+        hashed_password = await hash_password(password)
         new_user = Users(
             email=email,
             username=username,
@@ -100,7 +100,12 @@ class AuthService:
         return new_user
 
     async def create_tokens(self, user: Users) -> dict:
-        access_token = await create_access_token(data={"sub": str(user.id)})
+        claims = {"sub": str(user.id)}
+        if settings.AUTH_EMBED_IDENTITY_CLAIMS:
+            identity = await get_identity(self.db, str(user.id))
+            if identity:
+                claims.update(identity_claims(identity))
+        access_token = await create_access_token(data=claims)
         refresh_token = await create_access_token(
             data={"sub": str(user.id), "type": "refresh"},
             expires_delta=timedelta(days=7),
@@ -123,10 +128,11 @@ class AuthService:
         
         user = await self._get_user_by_id(id)
         if not user.is_active:
+            await invalidate_identity(id)
             raise HTTPException(status_code=400, detail="Inactive user")
         return await self.create_tokens(user)
 
-    async def get_current_user(self, token: str) -> Users:
+    async def get_current_user(self, token: str) -> Identity:
         payload = await verify_token(token)
         id = payload.get("sub")
         if not id:
@@ -135,7 +141,15 @@ class AuthService:
                 detail="Invalid authentication credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return await self._get_user_by_id(id)
+
+        identity = identity_from_claims(payload) or await get_identity(self.db, id)
+        if not identity:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return identity
 
 async def get_auth_service(db: AsyncSession = Depends(get_db)):
     return AuthService(db)
@@ -143,7 +157,7 @@ async def get_auth_service(db: AsyncSession = Depends(get_db)):
 async def get_current_active_user(
     token: str = Depends(get_token),
     auth_service: AuthService = Depends(get_auth_service),
-) -> Users:
+) -> Identity:
     user = await auth_service.get_current_user(token)
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -152,7 +166,7 @@ async def get_current_active_user(
 async def get_current_superuser(
     token: str = Depends(get_token),
     auth_service: AuthService = Depends(get_auth_service),
-) -> Users:
+) -> Identity:
     user = await auth_service.get_current_user(token)
     if not user.is_superuser:
         raise HTTPException(
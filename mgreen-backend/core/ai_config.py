@@ -1,7 +1,9 @@
-from openai import OpenAI
+from typing import Optional
+import httpx
+from openai import AsyncOpenAI
 from core.config import settings
 
-OPENAI_CLIENT = OpenAI(api_key=settings.OPENAI_API_KEY)
+OPENAI_CLIENT: Optional[AsyncOpenAI] = None
 
 AI_CONFIG = {
     "role": "Plants AI - Знаток по микрозелени",  
@@ -12,3 +14,46 @@ AI_CONFIG = {
 }
 
 
+def create_openai_client() -> AsyncOpenAI:
+    """Build an AsyncOpenAI client backed by a single keep-alive httpx pool."""
+    http_client = httpx.AsyncClient(
+        http2=settings.OPENAI_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            settings.OPENAI_TIMEOUT,
+            connect=settings.OPENAI_CONNECT_TIMEOUT,
+        ),
+    )
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        http_client=http_client,
+        timeout=settings.OPENAI_TIMEOUT,
+    )
+
+
+async def init_openai_client() -> AsyncOpenAI:
+    """Create the process-wide client. Called on app startup."""
+    global OPENAI_CLIENT
+    if OPENAI_CLIENT is None:
+        OPENAI_CLIENT = create_openai_client()
+    return OPENAI_CLIENT
+
+
+async def close_openai_client():
+    """Close the connection pool. Called on app shutdown."""
+    global OPENAI_CLIENT
+    if OPENAI_CLIENT is not None:
+        await OPENAI_CLIENT.close()
+        OPENAI_CLIENT = None
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Return the shared client, creating it lazily outside of the app (scripts, shells)."""
+    global OPENAI_CLIENT
+    if OPENAI_CLIENT is None:
+        OPENAI_CLIENT = create_openai_client()
+    return OPENAI_CLIENT
@@ -0,0 +1,42 @@
+from typing import Callable, Type
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+
+
+def body_limit_route(max_size: int) -> Type[APIRoute]:
+    """
+    Route class that refuses request bodies above `max_size` bytes while they
+    are being received, before FastAPI parses (and spools) a multipart form:
+    a too large Content-Length is rejected right away, and a body without one
+    is cut off as soon as it grows past the limit.
+    """
+
+    class BodyLimitRoute(APIRoute):
+        def get_route_handler(self) -> Callable:
+            handler = super().get_route_handler()
+
+            async def limited_handler(request: Request) -> Response:
+                too_large = HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Request body exceeds maximum size of {max_size // 1048576}MB"
+                )
+                content_length = request.headers.get("content-length")
+                if content_length and content_length.isdigit() and int(content_length) > max_size:
+                    raise too_large
+
+                received = 0
+                receive = request.receive
+
+                async def limited_receive():
+                    nonlocal received
+                    message = await receive()
+                    received += len(message.get("body", b""))
+                    if received > max_size:
+                        raise too_large
+                    return message
+
+                return await handler(Request(request.scope, limited_receive))
+
+            return limited_handler
+
+    return BodyLimitRoute
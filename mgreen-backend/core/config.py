@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import os
 from dotenv import load_dotenv
@@ -9,15 +10,76 @@ load_dotenv()
 class Settings(BaseSettings):
     DATABASE_URL: str
     OPENAI_API_KEY: str
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_KEEPALIVE_EXPIRY: float = 30.0
+    OPENAI_CONNECT_TIMEOUT: float = 10.0
+    OPENAI_TIMEOUT: float = 120.0
+    OPENAI_HTTP2: bool = False
+
+    VISION_IMAGE_MAX_EDGE: int = 1024
+    VISION_IMAGE_FORMAT: str = "JPEG"
+    VISION_IMAGE_QUALITY: int = 85
+    VISION_IMAGE_DETAIL: str = "auto"
+    VISION_IMAGE_LOW_DETAIL_MAX_EDGE: int = 512
+    IMAGE_EXECUTOR_WORKERS: int = 2
+
+    REDIS_URL: Optional[str] = None
+    VISION_CACHE_ENABLED: bool = True
+    VISION_CACHE_TTL_SECONDS: int = 21600
+    VISION_CACHE_MAX_SIZE: int = 1024
+
+    ANALYTICS_PROMPT_TOKEN_BUDGET: int = 2000
+    RECORD_STATS_WINDOW_DAYS: int = 7
+    RECORD_SERIES_MAX_POINTS: int = 1000
+    BULK_RECORDS_MAX_ROWS: int = 50000
     WEBHOOK_TELEGRAM_API: str
 
     KAFKA_BOOTSTRAP_SERVERS: str = "192.168.11.11:9092"  
     KAFKA_GROUP_ID: str = "telegram_bot_group"
     KAFKA_TOPIC: str = "telegram_messages"
+    KAFKA_LINGER_MS: int = 20
+    # gzip needs no extra packages; lz4/snappy/zstd need their python libs installed
+    KAFKA_COMPRESSION_TYPE: Optional[str] = "gzip"
+    KAFKA_MAX_BATCH_SIZE: int = 65536
+    KAFKA_ACKS: int = 1
+    KAFKA_HEALTH_TIMEOUT: float = 2.0
+
+    RECORD_JOB_WORKERS: int = 4
+    # Seconds stop() lets running jobs finish before putting them back to queued
+    RECORD_JOB_SHUTDOWN_TIMEOUT: float = 30.0
+    # A job 'running' without an update for this long is considered abandoned
+    RECORD_JOB_STALE_AFTER: int = 600
+    RECORD_PHOTO_MAX_SIZE: int = 10485760
+
+    RECORDS_PARTITION_MONTHS_AHEAD: int = 3
+    # Months of raw records to keep; None keeps everything
+    RECORDS_RETENTION_MONTHS: Optional[int] = None
+    RECORDS_PARTITION_MAINTENANCE_INTERVAL: int = 21600
+    # Seconds DETACH PARTITION may wait for its lock before giving up
+    RECORDS_PARTITION_LOCK_TIMEOUT: int = 5
+
+    # Days of raw photo-less readings to keep before rolling them up
+    # (hourly for active seedbeds, daily for harvested ones); None (default) keeps them raw
+    RECORDS_RAW_RETENTION_DAYS_ACTIVE: Optional[int] = None
+    RECORDS_RAW_RETENTION_DAYS_HARVESTED: Optional[int] = None
+    RECORDS_COMPACTION_BATCH_SIZE: int = 5000
+    RECORDS_COMPACTION_INTERVAL: int = 3600
+
+    RECORD_WRITE_BUFFER_ENABLED: bool = False
+    RECORD_WRITE_BUFFER_MAX_ROWS: int = 200
+    RECORD_WRITE_BUFFER_MAX_DELAY_MS: int = 5
+    # on | off | local | remote_write | remote_apply; empty keeps the server default
+    RECORD_WRITE_BUFFER_SYNCHRONOUS_COMMIT: Optional[str] = None
 
     MINIO_ACCESS_KEY: str
     MINIO_SECRET_KEY: str
     MINIO_ENDPOINT: str
+    MINIO_MAX_POOL_CONNECTIONS: int = 50
+    MINIO_EXECUTOR_WORKERS: int = 16
+    MINIO_MULTIPART_THRESHOLD: int = 8388608
+    MINIO_MULTIPART_CHUNKSIZE: int = 8388608
+    MINIO_MULTIPART_CONCURRENCY: int = 4
  
     IS_DEVELOPMENT: bool = True
     SECRET_KEY: str 
@@ -25,6 +87,18 @@ class Settings(BaseSettings):
     SUPER_ADMIN_EMAIL: str
     SUPER_ADMIN_PASSWORD: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 300000
+
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    # Hash/verify calls allowed to queue or run at once before new ones get 503
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    IDENTITY_CACHE_TTL_SECONDS: int = 60
+    IDENTITY_CACHE_MAX_SIZE: int = 10000
+    # Put role/active flag into access tokens so auth needs no DB or cache lookup.
+    # Embedded claims cannot be revoked before the token expires, so only enable
+    # this together with a short ACCESS_TOKEN_EXPIRE_MINUTES.
+    AUTH_EMBED_IDENTITY_CLAIMS: bool = False
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 600000000000
     
     model_config = SettingsConfigDict(env_file=".env")
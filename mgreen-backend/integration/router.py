@@ -19,7 +19,6 @@ async def create_telegram_integration(
 ):
     try:
         service = Integrations(commons.db)
-        await service.kafka_producer.start()  
         result = await service.create_telegram_integration(telegram_data)
         return result
     except Exception as e:
@@ -33,7 +32,6 @@ async def get_telegram_integration(
 ):
     try:
         service = Integrations(commons.db)
-        await service.kafka_producer.start() 
         result = await service.get_telegram_integration(telegram_id)
         return result
     except Exception as e:
@@ -47,7 +45,6 @@ async def delete_telegram_integration(
 ):
     try:
         service = Integrations(commons.db)
-        await service.kafka_producer.start()  
         result = await service.delete_telegram_integration(telegram_id)
         return result
     except Exception as e:
@@ -4,22 +4,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from .models import TelegramIntegration
 from .schemas import TelegramIntegrationCreate, TelegramIntegrationResponse
 from utils.logger import logger
-from utils.kafka_client import KafkaProducer
+from utils.kafka_client import KafkaProducer, kafka_producer as shared_kafka_producer
 from datetime import datetime, timezone, timedelta
 from typing import List 
 from datetime import datetime, timedelta
 
 class Integrations:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, kafka_producer: KafkaProducer = shared_kafka_producer):
         self.db = db
-        self.kafka_producer = KafkaProducer()
+        self.kafka_producer = kafka_producer
 
     async def create_telegram_integration(self, telegram_data: TelegramIntegrationCreate) -> TelegramIntegrationResponse:
         """Create a new Telegram integration and notify via Kafka."""
         try:
-            # Start Kafka producer
-            await self.kafka_producer.start()
-
             # Begin transaction
             async with self.db.begin() as transaction:
                 new_integration = TelegramIntegration(telegram_id=telegram_data.telegram_id)
@@ -49,9 +46,6 @@ class Integrations:
             logger.error(f"Error creating Telegram integration: {str(e)}")
             raise Exception(f"Failed to create integration: {str(e)}")
 
-        finally:
-            # Always stop the producer
-            await self.kafka_producer.stop()
     async def get_telegram_integration(self, telegram_id: int) -> TelegramIntegrationResponse:
         try:
             query = select(TelegramIntegration).where(TelegramIntegration.telegram_id == telegram_id)
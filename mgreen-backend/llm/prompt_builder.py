@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+import tiktoken
+from .schemas import AIModelType
+
+RECORD_COLUMNS = [
+    "water_temperature",
+    "air_temperature",
+    "air_humidity",
+    "light_level",
+    "height_plant",
+]
+
+_encodings: Dict[str, "tiktoken.Encoding"] = {}
+
+
+def get_encoding(model: str = AIModelType.GPT4OMINI) -> "tiktoken.Encoding":
+    model = str(getattr(model, "value", model))
+    if model not in _encodings:
+        try:
+            _encodings[model] = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encodings[model] = tiktoken.get_encoding("o200k_base")
+    return _encodings[model]
+
+
+def count_tokens(text: str, model: str = AIModelType.GPT4OMINI) -> int:
+    return len(get_encoding(model).encode(text))
+
+
+def _format_value(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+class RecordsPromptBuilder:
+    """
+    Builds the RECORDS section of the per-seedbed analytics prompt within a token budget.
+
+    Seedbed/plant context is written once, records become a pipe-separated table.
+    When the table does not fit, the newest records are kept as-is, older ones are
+    collapsed into daily averages, and the daily rows are evenly sampled if needed.
+    """
+
+    def __init__(
+        self,
+        token_budget: int,
+        model: str = AIModelType.GPT4OMINI,
+        recent_share: float = 0.6
+    ):
+        self.token_budget = token_budget
+        self.model = model
+        self.recent_share = recent_share
+
+    def _tokens(self, text: str) -> int:
+        return count_tokens(text, self.model)
+
+    def _context_section(self, context: Dict[str, object]) -> str:
+        lines = ["SEEDBED:"]
+        for key, value in context.items():
+            if value is not None:
+                lines.append(f"- {key}: {value}")
+        return "\n".join(lines)
+
+    def _record_row(self, record: Dict[str, object]) -> str:
+        created_at: datetime = record["created_at"]
+        values = [_format_value(record.get(column)) for column in RECORD_COLUMNS]
+        return "|".join([created_at.strftime("%Y-%m-%d %H:%M"), *values])
+
+    def _daily_rows(self, records: List[Dict[str, object]]) -> List[str]:
+        days: "OrderedDict[str, List[Dict[str, object]]]" = OrderedDict()
+        for record in records:
+            days.setdefault(record["created_at"].strftime("%Y-%m-%d"), []).append(record)
+
+        rows = []
+        for day, items in days.items():
+            means = []
+            for column in RECORD_COLUMNS:
+                values = [item[column] for item in items if item.get(column) is not None]
+                means.append(_format_value(sum(values) / len(values)) if values else "-")
+            rows.append("|".join([f"{day} avg(n={len(items)})", *means]))
+        return rows
+
+    def _fit(self, rows: List[str], budget: int) -> List[str]:
+        """Evenly sample `rows` (keeping the last one) so that they fit in `budget` tokens."""
+        if not rows or budget <= 0:
+            return []
+        costs = [self._tokens(row) + 1 for row in rows]
+        if sum(costs) <= budget:
+            return rows
+        average = sum(costs) / len(costs)
+        keep = max(1, int(budget // average))
+        step = len(rows) / keep
+        picked = sorted({len(rows) - 1 - int(i * step) for i in range(keep)})
+        return [rows[i] for i in picked]
+
+    def build(self, context: Dict[str, object], records: List[Dict[str, object]]) -> str:
+        """`records` must be ordered oldest first."""
+        context_section = self._context_section(context)
+        header = "RECORDS (time|" + "|".join(RECORD_COLUMNS) + "):"
+        # Small reserve for the separators and section comments added below.
+        budget = self.token_budget - self._tokens(context_section) - self._tokens(header) - 24
+
+        rows = [self._record_row(record) for record in records]
+        if sum(self._tokens(row) + 1 for row in rows) <= budget:
+            return "\n".join([context_section, header, *rows])
+
+        recent: List[str] = []
+        recent_budget = int(budget * self.recent_share)
+        used = 0
+        for row in reversed(rows):
+            cost = self._tokens(row) + 1
+            if used + cost > recent_budget:
+                break
+            recent.insert(0, row)
+            used += cost
+
+        older = records[:len(records) - len(recent)]
+        aggregated = self._fit(self._daily_rows(older), budget - used)
+
+        lines = [context_section, header]
+        if aggregated:
+            lines.append(f"# {len(older)} older records as daily averages")
+            lines.extend(aggregated)
+        lines.append(f"# latest {len(recent)} records")
+        lines.extend(recent)
+        return "\n".join(lines)
@@ -1,11 +1,10 @@
-import asyncio
 import base64
 import uuid
 from datetime import datetime
 from typing import Any, Optional
+from openai import NOT_GIVEN
 from .schemas import MAXTOKENS, AIModelType, LLMTemperature
-import openai
-from core.config import settings
+from core.ai_config import get_openai_client
 
 class LLMRequest:
     def __init__(
@@ -19,7 +18,7 @@ class LLMRequest:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.messages = []
-        self.client = client or openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = client or get_openai_client()
         self.request_id = str(uuid.uuid4())
         self.created_at = datetime.now()
         
@@ -49,7 +48,7 @@ class LLMRequest:
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         model: Optional[str] = None,
-        timeout: int = 60
+        timeout: Optional[float] = None
     ) -> str:
         if new_user_message:
             self.add_user_message(new_user_message)
@@ -57,13 +56,13 @@ class LLMRequest:
         try:
             start_time = datetime.now()
             
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
+            # Without an explicit timeout the shared client's OPENAI_TIMEOUT applies.
+            response = await self.client.chat.completions.create(
                 model=model or self.model,
                 messages=self.messages,
                 temperature=temperature or self.temperature,
                 max_tokens=max_tokens or self.max_tokens,
-                timeout=timeout
+                timeout=timeout if timeout is not None else NOT_GIVEN
             )
             
             end_time = datetime.now()
@@ -87,12 +86,18 @@ class LLMRequest:
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         model: Optional[str] = None,
-        timeout: int = 120
+        timeout: Optional[float] = None,
+        mime_type: str = "image/jpeg",
+        detail: Optional[str] = None
     ) -> str:
         try:
             start_time = datetime.now()
             
             image_base64 = base64.b64encode(image_data).decode('utf-8')
+
+            image_url = {"url": f"data:{mime_type};base64,{image_base64}"}
+            if detail:
+                image_url["detail"] = detail
             
             messages = [
                 {
@@ -104,9 +109,7 @@ class LLMRequest:
                         },
                         {
                             "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{image_base64}"
-                            }
+                            "image_url": image_url
                         }
                     ]
                 }
@@ -115,13 +118,12 @@ class LLMRequest:
             if self.messages and self.messages[0]["role"] == "system":
                 messages.insert(0, self.messages[0])
             
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
+            response = await self.client.chat.completions.create(
                 model=model or AIModelType.GPT4OMINI, 
                 messages=messages,
                 temperature=temperature or self.temperature,
                 max_tokens=max_tokens or self.max_tokens,
-                timeout=timeout
+                timeout=timeout if timeout is not None else NOT_GIVEN
             )
             
             end_time = datetime.now()
@@ -3,6 +3,20 @@ import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
 from global_router import router
 from utils.init_migration import init_migration
+from core.ai_config import init_openai_client, close_openai_client
+from records.jobs import record_jobs
+from records.write_buffer import record_write_buffer
+from records.partitions import partition_maintenance
+from records.rollups import record_compaction
+from core.config import settings
+from utils.metrics import metrics
+from utils.minio_service import storage_executor
+from utils.image_processing import image_executor
+from utils.password import password_executor
+from records.analysis_cache import vision_cache
+from auth.identity import identity_cache
+from utils.kafka_client import kafka_producer
+from utils.logger import logger
 
 app = FastAPI(
     title="MICROGREENS API",
@@ -23,11 +37,40 @@ app.include_router(router)
 @app.on_event("startup")
 async def startup():
     # await init_migration()
-    pass
+    await init_openai_client()
+    try:
+        await kafka_producer.start()
+    except Exception as e:
+        # Not fatal: send_message() retries the start on first use.
+        logger.error(f"Kafka producer failed to start: {str(e)}")
+    if settings.RECORD_WRITE_BUFFER_ENABLED:
+        await record_write_buffer.start()
+    await record_jobs.start()
+    await partition_maintenance.start()
+    await record_compaction.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await record_compaction.stop()
+    await partition_maintenance.stop()
+    await record_jobs.stop()
+    await record_write_buffer.stop()
+    await kafka_producer.stop()
+    await close_openai_client()
+    storage_executor.shutdown(wait=True)
+    image_executor.shutdown(wait=True)
+    password_executor.shutdown(wait=True)
+    await vision_cache.close()
+    await identity_cache.close()
 
 @app.get("/healthcheck/", include_in_schema=False)
 async def healtcheck():
-    return {"status": "ok"}
+    kafka = await kafka_producer.health()
+    return {"status": "ok" if kafka["status"] == "ok" else "degraded", "kafka": kafka}
+
+@app.get("/metrics/", include_in_schema=False)
+async def get_metrics():
+    return metrics.snapshot()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-from sqlalchemy import String, ForeignKey, Boolean, DateTime, Integer, Text
+from sqlalchemy import String, ForeignKey, Boolean, DateTime, Integer, Text, Index
 from datetime import datetime
 from sqlalchemy.dialects.postgresql import UUID 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -10,6 +10,9 @@ from typing import List
 
 class Plants(Base):
     __tablename__ = "plants"
+    __table_args__ = (
+        Index("ix_plants_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -24,13 +27,13 @@ class Plants(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
-        default=datetime.now(),
+        default=datetime.now,
         doc="Timestamp when the registration record was created."
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=True,
-        onupdate=datetime.now(),
+        onupdate=datetime.now,
         doc="Timestamp when the registration record was last updated."
     )
 
@@ -56,13 +59,13 @@ class PlantsType(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
-        default=datetime.now(),
+        default=datetime.now,
         doc="Timestamp when the registration record was created."
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=True,
-        onupdate=datetime.now(),
+        onupdate=datetime.now,
         doc="Timestamp when the registration record was last updated."
     )
 
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Response, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Response, Depends, HTTPException, Query, status, UploadFile, File
 from .plants_schemas import PlantBase, PlantRead, PlantListResponse, PlantImage
 from .plants_service import PlantsService
-from typing import List
+from typing import List, Optional
 import mimetypes
 import base64
 from core.dependencies import CommonDependencies
@@ -16,13 +16,14 @@ router = APIRouter(
 
 @router.get("/all", response_model=PlantListResponse)
 async def get_all_plants(
-    page: int = 1,
-    page_size: int = 10,
+    cursor: Optional[str] = None,
+    page_size: int = Query(10, ge=1, le=100),
+    include_total: bool = False,
     commons: CommonDependencies = Depends()
 ):
     db = commons.db
     service = PlantsService(db)
-    plant_list = await service.get_all(page=page, page_size=page_size)
+    plant_list = await service.get_all(cursor=cursor, page_size=page_size, include_total=include_total)
     return plant_list
 
 @router.get("/{id}", response_model=PlantRead)
@@ -28,7 +28,9 @@ class PlantRead(PlantBase, ReadBase):
 class PlantListResponse(BaseModel):
     items: List[PlantRead] = Field(..., description="List of plants")
     page_size: int = Field(..., description="Number of items per page")
-    page_count: int = Field(..., description="Total number of pages based on page_size")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, null on the last page")
+    total_count: Optional[int] = Field(None, description="Only when include_total=true")
+    page_count: Optional[int] = Field(None, description="Total number of pages, only when include_total=true")
 
     class Config:
         from_attributes = True
@@ -1,49 +1,65 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, func
+from sqlalchemy import select, update, delete, func, tuple_
 from sqlalchemy.orm import selectinload
 from plants.models import Plants
 from fastapi import UploadFile, HTTPException
 from llm.request import LLMRequest
 import json
-from core.ai_config import OPENAI_CLIENT
+from core.ai_config import get_openai_client
 from plants.plants_type.plants_type_service import PlantsTypeService
 from llm.schemas import LLMTemperature, MAXTOKENS, AIModelType
 from .plants_schemas import PlantBase, PlantRead, PlantListResponse
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
-import math
+from core.pagination import encode_cursor, decode_cursor, page_count
 import imghdr
 from utils.logger import logger
+from utils.image_processing import prepare_image
 
 class PlantsService:
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.client = OPENAI_CLIENT
+        self.client = get_openai_client()
 
 
-    async def get_all(self, page: int = 1, page_size: int = 10) -> PlantListResponse:
-        offset = (page - 1) * page_size
-        
+    async def get_all(
+        self,
+        cursor: Optional[str] = None,
+        page_size: int = 10,
+        include_total: bool = False
+    ) -> PlantListResponse:
         query = (
             select(Plants)
             .options(selectinload(Plants.plant_type))
-            .offset(offset)
-            .limit(page_size)
+            .order_by(Plants.created_at.desc(), Plants.id.desc())
+            .limit(page_size + 1)
         )
+
+        after = decode_cursor(cursor, (datetime.fromisoformat, UUID))
+        if after:
+            query = query.where(tuple_(Plants.created_at, Plants.id) < after)
+
         result = await self.db.execute(query)
         plants = result.scalars().all()
-        
-        total_query = select(func.count(Plants.id))
-        total_result = await self.db.execute(total_query)
-        total = total_result.scalar()
 
-        page_count = math.ceil(total / page_size) if total > 0 else 0
+        next_cursor = None
+        if len(plants) > page_size:
+            plants = plants[:page_size]
+            next_cursor = encode_cursor([plants[-1].created_at, plants[-1].id])
+        
+        total = None
+        if include_total:
+            total_query = select(func.count(Plants.id))
+            total_result = await self.db.execute(total_query)
+            total = total_result.scalar()
 
         return PlantListResponse(
             items=[PlantRead.model_validate(p) for p in plants],
             page_size=page_size,
-            page_count=page_count
+            next_cursor=next_cursor,
+            total_count=total,
+            page_count=page_count(total, page_size)
         )
 
     async def get_by_id(self, id: str) -> Optional[PlantRead]:
@@ -175,9 +191,12 @@ Analyze the photo. Follow the system prompt instructions.
             logger.info("Sending image to LLM for analysis")
             
             try:
+                prepared = await prepare_image(image)
                 response_text = await llm.send_with_image(
-                    image,
-                    prompt
+                    prepared.data,
+                    prompt,
+                    mime_type=prepared.mime_type,
+                    detail=prepared.detail
                 )
                 logger.info("Received response from LLM")
                 if "```json" in response_text:
@@ -0,0 +1,48 @@
+from typing import Optional
+from core.config import settings
+from seedbeds.schemas import SeedbedResponseFull
+from utils.cache import create_cache
+from utils.metrics import metrics
+from .schemas import RecordsBase
+
+# Readings closer than one step apart are treated as the same conditions.
+_SENSOR_STEPS = {
+    "water_temperature": 0.5,
+    "air_temperature": 0.5,
+    "air_humidity": 1.0,
+    "light_level": 50.0,
+    "height_plant": 0.5,
+}
+
+vision_cache = create_cache(
+    "vision",
+    ttl=settings.VISION_CACHE_TTL_SECONDS,
+    max_size=settings.VISION_CACHE_MAX_SIZE,
+)
+
+
+def _quantize(value: Optional[float], step: float) -> str:
+    if value is None:
+        return "-"
+    return f"{round(value / step) * step:g}"
+
+
+def vision_cache_key(seedbed: SeedbedResponseFull, record: RecordsBase, image_hash: str) -> str:
+    sensors = ",".join(
+        _quantize(getattr(record, name), step) for name, step in _SENSOR_STEPS.items()
+    )
+    return f"{seedbed.id}:{seedbed.plant.plant_type_id}:{image_hash}:{sensors}"
+
+
+async def get_cached_analysis(key: str) -> Optional[dict]:
+    if not settings.VISION_CACHE_ENABLED:
+        return None
+    with metrics.timer("vision_cache.get"):
+        value = await vision_cache.get(key)
+    metrics.incr("vision_cache.hit" if value is not None else "vision_cache.miss")
+    return value
+
+
+async def set_cached_analysis(key: str, value: dict):
+    if settings.VISION_CACHE_ENABLED:
+        await vision_cache.set(key, value)
@@ -0,0 +1,19 @@
+from typing import List
+from pydantic import TypeAdapter
+from .schemas import BulkRecordItem
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+_items_adapter = TypeAdapter(List[BulkRecordItem])
+
+
+def parse_bulk_body(body: bytes, content_type: str) -> List[BulkRecordItem]:
+    """
+    Validate a JSON array or NDJSON body in a single pydantic-core pass.
+    NDJSON lines are joined into one JSON array instead of being parsed one by one.
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in NDJSON_CONTENT_TYPES:
+        lines = [line for line in body.splitlines() if line.strip()]
+        body = b"[" + b",".join(lines) + b"]"
+    return _items_adapter.validate_json(body)
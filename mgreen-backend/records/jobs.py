@@ -0,0 +1,178 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional, Set
+from uuid import UUID
+from sqlalchemy import select, update
+from database import SessionLocal
+from core.config import settings
+from utils.logger import logger
+from utils.minio_service import bucket_images
+from .models import Records, RecordJob, RecordJobStatusEnum
+from .schemas import RecordsBase
+from .service import RecordsService
+from .summary import set_last_analysis
+
+
+class RecordJobQueue:
+    """
+    In-process worker pool for record analysis jobs.
+
+    Job state lives in the `record_jobs` table, the queue only carries job ids.
+    A job is claimed with a conditional UPDATE, so several API processes can
+    share the table without running the same job twice. Jobs interrupted by a
+    shutdown are put back to queued; jobs left running by a crashed process
+    are requeued at startup once they are RECORD_JOB_STALE_AFTER old.
+    """
+
+    def __init__(self, workers: int = settings.RECORD_JOB_WORKERS):
+        self.workers = workers
+        self.queue: Optional[asyncio.Queue] = None
+        self.tasks: List[asyncio.Task] = []
+        self.running: Set[UUID] = set()
+        self.stopping = False
+
+    async def start(self):
+        """Start the workers and pick up jobs left queued (or abandoned) by a previous run."""
+        self.stopping = False
+        self.queue = asyncio.Queue()
+        self.tasks = [
+            asyncio.create_task(self._worker(n), name=f"record-job-worker-{n}")
+            for n in range(self.workers)
+        ]
+        logger.info(f"Record job queue started with {self.workers} workers")
+
+        async with SessionLocal() as db:
+            stale_before = datetime.now() - timedelta(seconds=settings.RECORD_JOB_STALE_AFTER)
+            result = await db.execute(
+                update(RecordJob)
+                .where(
+                    RecordJob.status == RecordJobStatusEnum.RUNNING.value,
+                    RecordJob.updated_at.is_(None) | (RecordJob.updated_at < stale_before)
+                )
+                .values(status=RecordJobStatusEnum.QUEUED.value)
+                .returning(RecordJob.id)
+            )
+            stale = result.scalars().all()
+            await db.commit()
+            if stale:
+                logger.warning(f"Requeued {len(stale)} record jobs abandoned in running state")
+
+            result = await db.execute(
+                select(RecordJob.id)
+                .where(RecordJob.status == RecordJobStatusEnum.QUEUED.value)
+                .order_by(RecordJob.created_at)
+            )
+            for job_id in result.scalars().all():
+                await self.enqueue(job_id)
+
+    async def stop(self):
+        """
+        Stop taking jobs and let running ones finish for up to
+        RECORD_JOB_SHUTDOWN_TIMEOUT; jobs still running then are cancelled and
+        put back to queued. Jobs not started yet stay queued in the database.
+        """
+        self.stopping = True
+        for _ in self.tasks:
+            # Wake idle workers so they see `stopping`.
+            self.queue.put_nowait(None)
+        if self.tasks:
+            _, pending = await asyncio.wait(self.tasks, timeout=settings.RECORD_JOB_SHUTDOWN_TIMEOUT)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+        if self.running:
+            interrupted = list(self.running)
+            async with SessionLocal() as db:
+                await db.execute(
+                    update(RecordJob)
+                    .where(
+                        RecordJob.id.in_(interrupted),
+                        RecordJob.status == RecordJobStatusEnum.RUNNING.value
+                    )
+                    .values(status=RecordJobStatusEnum.QUEUED.value)
+                )
+                await db.commit()
+            logger.warning(f"Put {len(interrupted)} interrupted record jobs back to queued")
+            self.running.clear()
+        logger.info("Record job queue stopped")
+
+    async def enqueue(self, job_id: UUID):
+        if self.queue is None:
+            raise RuntimeError("Record job queue not started. Call start() first.")
+        await self.queue.put(job_id)
+
+    async def _worker(self, n: int):
+        while not self.stopping:
+            job_id = await self.queue.get()
+            if self.stopping:
+                break
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                logger.error(f"Record job {job_id} crashed in worker {n}: {str(e)}", exc_info=True)
+            finally:
+                self.queue.task_done()
+            # Not on cancellation: stop() puts jobs still in `running` back to queued.
+            self.running.discard(job_id)
+
+    async def _claim(self, db, job_id: UUID) -> Optional[RecordJob]:
+        result = await db.execute(
+            update(RecordJob)
+            .where(
+                RecordJob.id == job_id,
+                RecordJob.status == RecordJobStatusEnum.QUEUED.value
+            )
+            .values(status=RecordJobStatusEnum.RUNNING.value)
+            .returning(RecordJob)
+        )
+        job = result.scalar_one_or_none()
+        await db.commit()
+        if job:
+            self.running.add(job_id)
+        return job
+
+    async def _run(self, job_id: UUID):
+        async with SessionLocal() as db:
+            job = await self._claim(db, job_id)
+            if not job:
+                return
+
+            seedbed_id = job.seedbed_id
+            try:
+                result = await db.execute(select(Records).where(Records.id == job.record_id))
+                record = result.scalar_one_or_none()
+                if not record:
+                    raise ValueError(f"Record {job.record_id} not found")
+
+                image = await bucket_images.get_file(job.photo_key)
+
+                records_for_ai = RecordsBase(
+                    water_temperature=record.water_temperature,
+                    air_temperature=record.air_temperature,
+                    air_humidity=record.air_humidity,
+                    light_level=record.light_level,
+                    height_plant=record.height_plant,
+                    photo_link=record.photo_link
+                )
+
+                message = await RecordsService(db).record_analytics(records_for_ai, seedbed_id, image)
+
+                values = {"status": RecordJobStatusEnum.DONE.value, "result": message}
+                logger.info(f"Record job {job_id} done")
+
+            except Exception as e:
+                await db.rollback()
+                error = str(getattr(e, "detail", e))
+                values = {"status": RecordJobStatusEnum.FAILED.value, "error": error}
+                logger.error(f"Record job {job_id} failed: {error}")
+
+            await db.execute(
+                update(RecordJob).where(RecordJob.id == job_id).values(**values)
+            )
+            await set_last_analysis(db, seedbed_id, values.get("result"))
+            await db.commit()
+
+
+record_jobs = RecordJobQueue()
@@ -1,14 +1,30 @@
 from datetime import datetime
+from enum import Enum
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import TIMESTAMP, String, Integer, BigInteger, DateTime, ForeignKey, Float
+from sqlalchemy import TIMESTAMP, String, Integer, BigInteger, DateTime, ForeignKey, Float, Text, Index
+from sqlalchemy.dialects.postgresql import UUID
 from database import Base  
+import uuid
+
+
+class RecordJobStatusEnum(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
 
 
 class Records(Base):
     __tablename__ = "records"
+    # Range-partitioned by month on created_at, see records/partitions.py.
+    # Postgres requires the partition key in the primary key, so it is (id, created_at).
+    __table_args__ = (
+        Index("ix_records_soilId_created_at_id", "soilId", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[int] = mapped_column(
-        Integer, primary_key=True, index=True, doc="ID записи")
+        Integer, primary_key=True, autoincrement=True, index=True, doc="ID записи")
 
     soilId: Mapped[int] = mapped_column(
         ForeignKey("seedbeds.id", ondelete="CASCADE"),
@@ -16,7 +32,7 @@ class Records(Base):
     )
     
     photo_link: Mapped[str] = mapped_column(
-        String(255), nullable=False, doc="Ссылка на фото")
+        String(255), nullable=True, doc="Ссылка на фото, пусто для показаний без фото")
     
     water_temperature: Mapped[float] = mapped_column(
         Float, nullable=False, doc="Температура воды"
@@ -39,13 +55,253 @@ class Records(Base):
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
+        primary_key=True,
         nullable=False,
-        default=datetime.now(),
+        default=datetime.now,
         doc="Timestamp when the registration record was created."
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=True,
-        onupdate=datetime.now(),
+        onupdate=datetime.now,
         doc="Timestamp when the registration record was last updated."
-    )
\ No newline at end of file
+    )
+
+
+class RecordJob(Base):
+    __tablename__ = "record_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        index=True,
+    )
+
+    record_id: Mapped[int] = mapped_column(
+        Integer, nullable=False, index=True, doc="ID записи, которую анализирует задача"
+    )
+
+    seedbed_id: Mapped[int] = mapped_column(
+        ForeignKey("seedbeds.id", ondelete="CASCADE"),
+        nullable=False, doc="ID почвы, к которой относится запись"
+    )
+
+    photo_key: Mapped[str] = mapped_column(
+        String(255), nullable=True, doc="Ключ фото в хранилище"
+    )
+
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default=RecordJobStatusEnum.QUEUED.value,
+        index=True,
+        doc="Job status: 'queued', 'running', 'done' or 'failed'."
+    )
+
+    result: Mapped[str] = mapped_column(
+        Text, nullable=True, doc="Результат анализа"
+    )
+
+    error: Mapped[str] = mapped_column(
+        Text, nullable=True, doc="Текст ошибки, если анализ не удался"
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.now,
+        doc="Timestamp when the job was created."
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=True,
+        onupdate=datetime.now,
+        doc="Timestamp when the job was last updated."
+    )
+
+
+class SeedbedSummary(Base):
+    """
+    Running per-seedbed aggregates, updated in the same transaction as every
+    records insert so readers never have to scan `records`.
+    """
+    __tablename__ = "seedbed_summaries"
+
+    seedbed_id: Mapped[int] = mapped_column(
+        ForeignKey("seedbeds.id", ondelete="CASCADE"),
+        primary_key=True, doc="ID почвы"
+    )
+
+    record_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, doc="Количество записей"
+    )
+
+    height_plant_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, doc="Количество записей с высотой растения"
+    )
+
+    water_temperature_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, doc="Сумма температуры воды"
+    )
+    water_temperature_sumsq: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, doc="Сумма квадратов температуры воды"
+    )
+    water_temperature_last: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Последнее значение температуры воды"
+    )
+
+    air_temperature_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, doc="Сумма температуры воздуха"
+    )
+    air_temperature_sumsq: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, doc="Сумма квадратов температуры воздуха"
+    )
+    air_temperature_last: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Последнее значение температуры воздуха"
+    )
+
+    air_humidity_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, doc="Сумма влажности воздуха"
+    )
+    air_humidity_sumsq: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, doc="Сумма квадратов влажности воздуха"
+    )
+    air_humidity_last: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Последнее значение влажности воздуха"
+    )
+
+    light_level_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, doc="Сумма уровня света"
+    )
+    light_level_sumsq: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, doc="Сумма квадратов уровня света"
+    )
+    light_level_last: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Последнее значение уровня света"
+    )
+
+    height_plant_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, doc="Сумма высоты растения"
+    )
+    height_plant_sumsq: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, doc="Сумма квадратов высоты растения"
+    )
+    height_plant_last: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Последнее значение высоты растения"
+    )
+
+    last_record_id: Mapped[int] = mapped_column(
+        Integer, nullable=True, doc="ID последней записи"
+    )
+
+    last_record_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=True, doc="Время последней записи"
+    )
+
+    last_analysis: Mapped[str] = mapped_column(
+        Text, nullable=True, doc="Текст последнего анализа"
+    )
+
+    last_analysis_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=True, doc="Время последнего анализа"
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=True,
+        onupdate=datetime.now,
+        doc="Timestamp when the summary was last updated."
+    )
+
+
+class RollupGranularityEnum(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
+class RecordRollup(Base):
+    """
+    Hourly/daily aggregates of compacted `records` rows, see records/rollups.py.
+    Sums and counts are kept instead of averages so buckets can be merged.
+    """
+    __tablename__ = "records_rollup"
+
+    seedbed_id: Mapped[int] = mapped_column(
+        ForeignKey("seedbeds.id", ondelete="CASCADE"),
+        primary_key=True, doc="ID почвы"
+    )
+
+    granularity: Mapped[str] = mapped_column(
+        String(8), primary_key=True, doc="Размер интервала: hour или day"
+    )
+
+    bucket_start: Mapped[datetime] = mapped_column(
+        DateTime, primary_key=True, doc="Начало интервала"
+    )
+
+    record_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, doc="Количество свёрнутых записей"
+    )
+
+    height_plant_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, doc="Количество записей с высотой растения"
+    )
+
+    water_temperature_sum: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Сумма температуры воды"
+    )
+    water_temperature_min: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Минимум температуры воды"
+    )
+    water_temperature_max: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Максимум температуры воды"
+    )
+
+    air_temperature_sum: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Сумма температуры воздуха"
+    )
+    air_temperature_min: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Минимум температуры воздуха"
+    )
+    air_temperature_max: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Максимум температуры воздуха"
+    )
+
+    air_humidity_sum: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Сумма влажности воздуха"
+    )
+    air_humidity_min: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Минимум влажности воздуха"
+    )
+    air_humidity_max: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Максимум влажности воздуха"
+    )
+
+    light_level_sum: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Сумма уровня света"
+    )
+    light_level_min: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Минимум уровня света"
+    )
+    light_level_max: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Максимум уровня света"
+    )
+
+    height_plant_sum: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Сумма высоты растения"
+    )
+    height_plant_min: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Минимум высоты растения"
+    )
+    height_plant_max: Mapped[float] = mapped_column(
+        Float, nullable=True, doc="Максимум высоты растения"
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=True,
+        default=datetime.now,
+        onupdate=datetime.now,
+        doc="Timestamp when the rollup was last updated."
+    )
@@ -0,0 +1,197 @@
+import asyncio
+from datetime import datetime
+from typing import List, Optional, Set
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from database import engine
+from core.config import settings
+from utils.logger import logger
+from .models import Records
+
+PARTITION_PREFIX = f"{Records.__tablename__}_p"
+DEFAULT_PARTITION = f"{Records.__tablename__}_default"
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    month = value.month - 1 + months
+    return value.replace(year=value.year + month // 12, month=month % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    if not name.startswith(PARTITION_PREFIX):
+        return None
+    try:
+        return datetime.strptime(name[len(PARTITION_PREFIX):], "%Y%m")
+    except ValueError:
+        return None
+
+
+def retention_cutoff(retention_months: Optional[int]) -> Optional[datetime]:
+    """Start of the oldest month still kept; rows before it are expired."""
+    if not retention_months:
+        return None
+    return add_months(month_start(datetime.now()), -retention_months)
+
+
+async def list_partitions(conn) -> List[str]:
+    result = await conn.execute(
+        text("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :table
+        """),
+        {"table": Records.__tablename__}
+    )
+    return list(result.scalars().all())
+
+
+async def _create_partition(conn, month: datetime):
+    """
+    Create the partition for `month`. Rows that already landed in the default
+    partition for that month are moved into it in the same transaction, otherwise
+    Postgres refuses to add the partition.
+    """
+    name = partition_name(month)
+    bounds = {"start": month, "end": add_months(month, 1)}
+    has_rows = (await conn.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end)"),
+        bounds
+    )).scalar()
+
+    range_sql = f"FROM ('{bounds['start']:%Y-%m-%d}') TO ('{bounds['end']:%Y-%m-%d}')"
+    if not has_rows:
+        await conn.execute(text(f"CREATE TABLE {name} PARTITION OF {Records.__tablename__} FOR VALUES {range_sql}"))
+        return
+
+    await conn.execute(text(
+        f"CREATE TABLE {name} (LIKE {Records.__tablename__} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    await conn.execute(
+        text(f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE created_at >= :start AND created_at < :end
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """),
+        bounds
+    )
+    await conn.execute(text(f"ALTER TABLE {Records.__tablename__} ATTACH PARTITION {name} FOR VALUES {range_sql}"))
+
+
+async def ensure_partitions(months_ahead: int = settings.RECORDS_PARTITION_MONTHS_AHEAD) -> List[str]:
+    """
+    Make sure monthly partitions exist from the current month to `months_ahead`
+    months ahead, and for every month that has rows sitting in the default partition
+    (except expired months: drop_expired_partitions deletes those rows instead).
+    """
+    cutoff = retention_cutoff(settings.RECORDS_RETENTION_MONTHS)
+    created = []
+    async with engine.begin() as conn:
+        existing: Set[str] = set(await list_partitions(conn))
+        current = month_start(datetime.now())
+        months = {add_months(current, n) for n in range(months_ahead + 1)}
+        stray = await conn.execute(
+            text(f"SELECT DISTINCT date_trunc('month', created_at) FROM {DEFAULT_PARTITION}")
+        )
+        months.update(month for month in stray.scalars().all() if cutoff is None or month >= cutoff)
+
+    for month in sorted(months):
+        name = partition_name(month)
+        if name in existing:
+            continue
+        async with engine.begin() as conn:
+            await _create_partition(conn, month)
+        created.append(name)
+        logger.info(f"Created records partition {name}")
+    return created
+
+
+async def drop_expired_partitions(retention_months: Optional[int] = settings.RECORDS_RETENTION_MONTHS) -> List[str]:
+    """
+    Detach and drop monthly partitions that end before the retention cutoff,
+    and delete expired rows that landed in the default partition.
+    DETACH ... CONCURRENTLY is not allowed while the default partition exists,
+    so each step runs in its own short transaction with a lock timeout; what
+    cannot be locked is retried on the next run.
+    """
+    cutoff = retention_cutoff(retention_months)
+    if cutoff is None:
+        return []
+
+    async with engine.connect() as conn:
+        partitions = sorted(await list_partitions(conn))
+
+    dropped = []
+    for name in partitions:
+        month = partition_month(name)
+        if month is None or add_months(month, 1) > cutoff:
+            continue
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"SET LOCAL lock_timeout = '{settings.RECORDS_PARTITION_LOCK_TIMEOUT}s'"))
+                await conn.execute(text(f"ALTER TABLE {Records.__tablename__} DETACH PARTITION {name}"))
+                await conn.execute(text(f"DROP TABLE {name}"))
+        except DBAPIError as e:
+            logger.warning(f"Could not drop records partition {name}, will retry: {e}")
+            continue
+        dropped.append(name)
+        logger.info(f"Dropped records partition {name} (retention {retention_months} months)")
+
+    if DEFAULT_PARTITION in partitions:
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"SET LOCAL lock_timeout = '{settings.RECORDS_PARTITION_LOCK_TIMEOUT}s'"))
+                deleted = (await conn.execute(
+                    text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :cutoff"),
+                    {"cutoff": cutoff}
+                )).rowcount
+        except DBAPIError as e:
+            logger.warning(f"Could not prune {DEFAULT_PARTITION}, will retry: {e}")
+        else:
+            if deleted:
+                logger.info(f"Deleted {deleted} expired records from {DEFAULT_PARTITION}")
+    return dropped
+
+
+class PartitionMaintenance:
+    """Runs partition creation and retention at startup and then periodically."""
+
+    def __init__(self, interval: int = settings.RECORDS_PARTITION_MAINTENANCE_INTERVAL):
+        self.interval = interval
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self.task = asyncio.create_task(self._loop(), name="records-partition-maintenance")
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def run_once(self):
+        await ensure_partitions()
+        await drop_expired_partitions()
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Records partition maintenance failed: {str(e)}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+
+partition_maintenance = PartitionMaintenance()
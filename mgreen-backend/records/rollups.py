@@ -0,0 +1,220 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import func, select, text
+from database import SessionLocal
+from core.config import settings
+from seedbeds.models import Seedbeds
+from utils.logger import logger
+from utils.metrics import metrics
+from .models import Records, RecordRollup, RollupGranularityEnum
+from .stats import SENSOR_COLUMNS
+
+# Retention of raw photo-less readings per seedbed state. Rows with a photo are the
+# analysed checkpoints (jobs and MinIO objects point at them) and are never compacted.
+RETENTION_POLICIES = {
+    "active": (settings.RECORDS_RAW_RETENTION_DAYS_ACTIVE, RollupGranularityEnum.HOUR),
+    "harvested": (settings.RECORDS_RAW_RETENTION_DAYS_HARVESTED, RollupGranularityEnum.DAY),
+}
+
+_ROLLUP_COLUMNS = ["record_count", "height_plant_count"] + [
+    f"{column}_{agg}" for column in SENSOR_COLUMNS for agg in ("sum", "min", "max")
+]
+
+_MERGE = ", ".join(
+    [f"{column} = records_rollup.{column} + excluded.{column}" for column in ("record_count", "height_plant_count")]
+    + [
+        f"{column}_sum = coalesce(records_rollup.{column}_sum, 0) + coalesce(excluded.{column}_sum, 0), "
+        f"{column}_min = least(records_rollup.{column}_min, excluded.{column}_min), "
+        f"{column}_max = greatest(records_rollup.{column}_max, excluded.{column}_max)"
+        for column in SENSOR_COLUMNS
+    ]
+    + ["updated_at = now()"]
+)
+
+# Data-modifying CTEs always run to completion, the outer SELECT only reports
+# how many rows were folded in.
+_UPSERT = f"""
+    , upserted AS (
+        INSERT INTO records_rollup (seedbed_id, granularity, bucket_start, {", ".join(_ROLLUP_COLUMNS)}, updated_at)
+        SELECT seedbed_id, :granularity, bucket_start, {", ".join(_ROLLUP_COLUMNS)}, now() FROM agg
+        ON CONFLICT (seedbed_id, granularity, bucket_start) DO UPDATE SET {_MERGE}
+    )
+    SELECT count(*) FROM doomed
+"""
+
+# Deletes one batch of raw rows and folds them into rollups in a single statement,
+# so a crash can never lose rows or count them twice.
+_COMPACT_RECORDS = f"""
+    WITH doomed AS (
+        DELETE FROM records r
+        USING (
+            SELECT id, created_at FROM records
+            WHERE "soilId" = :seedbed_id AND photo_link IS NULL AND created_at < :cutoff
+            ORDER BY created_at
+            LIMIT :batch_size
+        ) b
+        WHERE r.id = b.id AND r.created_at = b.created_at
+        RETURNING r.*
+    ), agg AS (
+        SELECT "soilId" AS seedbed_id,
+               date_trunc(:granularity, created_at) AS bucket_start,
+               count(*) AS record_count,
+               count(height_plant) AS height_plant_count,
+               {", ".join(f"sum({c}) AS {c}_sum, min({c}) AS {c}_min, max({c}) AS {c}_max" for c in SENSOR_COLUMNS)}
+        FROM doomed
+        GROUP BY 1, 2
+    ){_UPSERT}
+"""
+
+# Re-rolls finer rollups (e.g. hourly ones of a seedbed that has since been
+# harvested) into the coarser granularity.
+_COMPACT_ROLLUPS = f"""
+    WITH doomed AS (
+        DELETE FROM records_rollup
+        WHERE seedbed_id = :seedbed_id AND granularity = :finer AND bucket_start < :cutoff
+        RETURNING *
+    ), agg AS (
+        SELECT seedbed_id,
+               date_trunc(:granularity, bucket_start) AS bucket_start,
+               sum(record_count) AS record_count,
+               sum(height_plant_count) AS height_plant_count,
+               {", ".join(f"sum({c}_sum) AS {c}_sum, min({c}_min) AS {c}_min, max({c}_max) AS {c}_max" for c in SENSOR_COLUMNS)}
+        FROM doomed
+        GROUP BY 1, 2
+    ){_UPSERT}
+"""
+
+
+def seedbed_state(seedbed, now: datetime) -> str:
+    harvested = seedbed.date_harvested
+    if harvested is not None and harvested.astimezone().replace(tzinfo=None) <= now:
+        return "harvested"
+    return "active"
+
+
+async def compact_seedbed(
+    seedbed_id: int,
+    cutoff: datetime,
+    granularity: RollupGranularityEnum,
+    batch_size: int = settings.RECORDS_COMPACTION_BATCH_SIZE
+) -> int:
+    """Roll raw rows older than `cutoff` into rollups, one batch per transaction."""
+    params = {
+        "seedbed_id": seedbed_id,
+        "cutoff": cutoff,
+        "granularity": granularity.value,
+        "batch_size": batch_size,
+    }
+    compacted = 0
+    while True:
+        async with SessionLocal() as db:
+            with metrics.timer("records.compaction.batch"):
+                result = await db.execute(text(_COMPACT_RECORDS), params)
+                deleted = result.scalar()
+                await db.commit()
+        compacted += deleted or 0
+        if not deleted or deleted < batch_size:
+            break
+        # Let the API breathe between batches.
+        await asyncio.sleep(0)
+
+    if granularity == RollupGranularityEnum.DAY:
+        async with SessionLocal() as db:
+            await db.execute(
+                text(_COMPACT_ROLLUPS),
+                {
+                    "seedbed_id": seedbed_id,
+                    "cutoff": cutoff,
+                    "granularity": granularity.value,
+                    "finer": RollupGranularityEnum.HOUR.value,
+                }
+            )
+            await db.commit()
+    return compacted
+
+
+async def run_compaction() -> int:
+    now = datetime.now()
+    async with SessionLocal() as db:
+        result = await db.execute(select(Seedbeds.id, Seedbeds.date_harvested))
+        seedbeds = result.all()
+
+    total = 0
+    for seedbed in seedbeds:
+        retention_days, granularity = RETENTION_POLICIES[seedbed_state(seedbed, now)]
+        if retention_days is None:
+            continue
+        cutoff = now - timedelta(days=retention_days)
+        # Only whole buckets are compacted, so a bucket never mixes raw rows and rollups.
+        cutoff = cutoff.replace(minute=0, second=0, microsecond=0)
+        if granularity == RollupGranularityEnum.DAY:
+            cutoff = cutoff.replace(hour=0)
+        total += await compact_seedbed(seedbed.id, cutoff, granularity)
+
+    metrics.incr("records.compaction.rows", total)
+    if total:
+        logger.info(f"Compacted {total} raw records into rollups")
+    return total
+
+
+def rollup_series_query(seedbed_id: int, start: datetime, end: datetime, bucket_start):
+    """Rollup rows shaped like the raw part of the series query (see series.py)."""
+    columns = [
+        bucket_start.label("bucket_start"),
+        RecordRollup.record_count.label("count"),
+        RecordRollup.height_plant_count.label("height_plant_count"),
+    ]
+    for column in SENSOR_COLUMNS:
+        columns += [
+            getattr(RecordRollup, f"{column}_sum").label(f"{column}_sum"),
+            getattr(RecordRollup, f"{column}_min").label(f"{column}_min"),
+            getattr(RecordRollup, f"{column}_max").label(f"{column}_max"),
+        ]
+    return select(*columns).where(
+        RecordRollup.seedbed_id == seedbed_id,
+        RecordRollup.bucket_start >= start,
+        RecordRollup.bucket_start < end
+    )
+
+
+def rollup_stats_query(seedbed_id: int, since: Optional[datetime] = None):
+    """Rollup buckets as one averaged row each, in STATS_COLUMNS order."""
+    columns = [RecordRollup.bucket_start.label("created_at")]
+    for column in SENSOR_COLUMNS:
+        count = RecordRollup.height_plant_count if column == "height_plant" else RecordRollup.record_count
+        columns.append(
+            (getattr(RecordRollup, f"{column}_sum") / func.nullif(count, 0)).label(column)
+        )
+    query = select(*columns).where(RecordRollup.seedbed_id == seedbed_id)
+    if since is not None:
+        query = query.where(RecordRollup.bucket_start >= since)
+    return query
+
+
+class RecordCompaction:
+    """Periodic compaction loop, started with the app."""
+
+    def __init__(self, interval: int = settings.RECORDS_COMPACTION_INTERVAL):
+        self.interval = interval
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self.task = asyncio.create_task(self._loop(), name="records-compaction")
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def _loop(self):
+        while True:
+            try:
+                await run_compaction()
+            except Exception as e:
+                logger.error(f"Records compaction failed: {str(e)}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+
+record_compaction = RecordCompaction()
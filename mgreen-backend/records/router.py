@@ -1,18 +1,26 @@
 import logging
 import mimetypes
-from fastapi import APIRouter, File, HTTPException, Path, Query, Response, Depends, UploadFile
-from typing import List
+from fastapi import APIRouter, File, Form, HTTPException, Path, Query, Request, Response, Depends, UploadFile
+from pydantic import ValidationError
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.dependencies import CommonDependencies
+from core.config import settings
+from core.pagination import page_count
+from core.body_limit import body_limit_route
 from utils.token import get_token
 from fastapi import status
 from sqlalchemy.exc import IntegrityError
 from .service import RecordsService
+from .jobs import record_jobs
+from .series import parse_bucket
+from .bulk import parse_bulk_body
 from .schemas import *
-from utils.minio_service import bucket_images
+from utils.minio_service import bucket_images, FileTooLargeError
 import base64
 import io
-from uuid import uuid4
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta
 from utils.logger import logger
 import traceback
 
@@ -27,25 +35,29 @@ router = APIRouter(
 @router.get("/records/{seedbed_id}", response_model=GetAllRecordsResponse)
 async def get_all_record(
     seedbed_id: int = Path(..., ge=1, description="ID почвы"),
-    page: int = Query(1, ge=1, description="Номер страницы"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы"),
     page_size: int = Query(10, ge=1, le=100, description="Элементов на странице"),
+    include_total: bool = Query(False, description="Посчитать общее количество записей"),
     commons: CommonDependencies = Depends()
 ):  
     db: AsyncSession = commons.db
     records_service = RecordsService(db)
 
     try:
-        records, total_count = await records_service.get_all_records_by_id(seedbed_id, page, page_size)
+        records, next_cursor, total_count = await records_service.get_all_records_by_id(
+            seedbed_id, cursor, page_size, include_total
+        )
 
-        page_count = (total_count + page_size - 1) // page_size
-        
         return {
             "records": records,
-            "page": page,
             "page_size": page_size,
-            "page_count": page_count
+            "next_cursor": next_cursor,
+            "total_count": total_count,
+            "page_count": page_count(total_count, page_size)
         }
     
+    except HTTPException:
+        raise
     except IntegrityError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -59,7 +71,7 @@ async def get_all_record(
         )
     
     
-@router.post("/record/{seedbed_id}", response_model=AddRecordResponse)
+@router.post("/record/{seedbed_id}", response_model=AddRecordResponse, status_code=status.HTTP_202_ACCEPTED)
 async def add_record_by_id(
     records: RecordsBase,
     seedbed_id: int = Path(..., ge=1, description="ID почвы"),
@@ -68,47 +80,39 @@ async def add_record_by_id(
     db: AsyncSession = commons.db   
     records_service = RecordsService(db)
 
-    original_photo = records.photo_link
+    if not records.photo_link or not records.photo_link.startswith("data:image/"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Для анализа требуется фото в формате data:image/...;base64"
+        )
 
     try:
-        if records.photo_link and records.photo_link.startswith("data:image/"):
-            header, base64_data = records.photo_link.split(",", 1)
-            mime_type = header.split(";")[0].split(":")[1]
-            extension = mimetypes.guess_extension(mime_type) or ".png"
-
-            try:
-                photo_data = base64.b64decode(base64_data)
-            except Exception as e:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Некорректные данные изображения: {str(e)}"
-                )
-            
-            filename = f"{uuid4()}{extension}"
-            
-            try:
-                bucket_images.upload_file(photo_data, filename)
-                photo_url = bucket_images.get_file_url(filename)
-                
-                records.photo_link = photo_url
-
-               
-            except ValueError as e:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Ошибка при загрузке изображения: {str(e)}"
-                )
-            
-        records_for_ai = RecordsBase(**records.model_dump())
-        records_for_ai.photo_link = original_photo
-
-        message = await records_service.record_analytics(records_for_ai, seedbed_id)
-        new_record = await records_service.add_record_by_id(records, seedbed_id)
+        header, base64_data = records.photo_link.split(",", 1)
+        mime_type = header.split(";")[0].split(":")[1]
+        extension = mimetypes.guess_extension(mime_type) or ".png"
 
-        return {
-            "message": message,
-            "record": new_record
-        }
+        try:
+            photo_data = base64.b64decode(base64_data)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Некорректные данные изображения: {str(e)}"
+            )
+        
+        filename = f"{uuid4()}{extension}"
+        
+        try:
+            await bucket_images.upload_file(photo_data, filename, settings.RECORD_PHOTO_MAX_SIZE)
+            records.photo_link = bucket_images.get_file_url(filename)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Ошибка при загрузке изображения: {str(e)}"
+            )
+
+        return await _add_record_and_enqueue(records_service, records, seedbed_id, filename)
+    except HTTPException:
+        raise
     except IntegrityError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -121,8 +125,238 @@ async def add_record_by_id(
             detail=f"Ошибка при добавлении записи: {str(e)}\nТрассировка:\n{tb}"
         )
 
+# The photo plus the other form fields and multipart boundaries.
+RECORD_UPLOAD_MAX_BODY = settings.RECORD_PHOTO_MAX_SIZE + 65536
+
+# Own route class so an oversized upload is refused while it is received,
+# not after the whole multipart body was spooled to disk.
+upload_router = APIRouter(route_class=body_limit_route(RECORD_UPLOAD_MAX_BODY))
+
+@upload_router.post("/record/{seedbed_id}/upload", response_model=AddRecordResponse, status_code=status.HTTP_202_ACCEPTED)
+async def add_record_with_photo(
+    seedbed_id: int = Path(..., ge=1, description="ID почвы"),
+    water_temperature: float = Form(..., description="Температура воды"),
+    air_temperature: float = Form(..., description="Температура воздуха"),
+    air_humidity: float = Form(..., description="Влажность воздуха"),
+    light_level: float = Form(..., description="Уровень света"),
+    height_plant: Optional[float] = Form(None, description="Высота растения"),
+    photo: UploadFile = File(..., description="Фотография"),
+    commons: CommonDependencies = Depends(),
+):
+    """
+    Multipart variant of POST /record/{seedbed_id}: the photo is sent as a file
+    and streamed to storage in chunks instead of being decoded from base64.
+    """
+    db: AsyncSession = commons.db
+    records_service = RecordsService(db)
+
+    if not photo.content_type or not photo.content_type.startswith("image/"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Для анализа требуется файл изображения"
+        )
+
+    extension = mimetypes.guess_extension(photo.content_type) or ".png"
+    filename = f"{uuid4()}{extension}"
+
+    try:
+        try:
+            await bucket_images.upload_fileobj(
+                photo.file,
+                filename,
+                photo.content_type,
+                settings.RECORD_PHOTO_MAX_SIZE
+            )
+        except FileTooLargeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Ошибка при загрузке изображения: {str(e)}"
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Ошибка при загрузке изображения: {str(e)}"
+            )
+        finally:
+            await photo.close()
+
+        records = RecordsBase(
+            water_temperature=water_temperature,
+            air_temperature=air_temperature,
+            air_humidity=air_humidity,
+            light_level=light_level,
+            height_plant=height_plant,
+            photo_link=bucket_images.get_file_url(filename)
+        )
+
+        return await _add_record_and_enqueue(records_service, records, seedbed_id, filename)
+    except HTTPException:
+        raise
+    except IntegrityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Ошибка при добавлении записи: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Ошибка при добавлении записи: {str(e)}"
+        )
+
+router.include_router(upload_router)
+
+async def _add_record_and_enqueue(
+    records_service: RecordsService,
+    records: RecordsBase,
+    seedbed_id: int,
+    photo_key: str
+) -> dict:
+    new_record = await records_service.add_record_by_id(records, seedbed_id)
+    job = await records_service.create_analysis_job(new_record, photo_key)
+    await record_jobs.enqueue(job.id)
+
+    return {
+        "message": "Запись добавлена, анализ поставлен в очередь",
+        "job_id": job.id,
+        "status": job.status,
+        "record": new_record
+    }
+
+@router.post("/bulk", response_model=BulkRecordsResponse, status_code=status.HTTP_201_CREATED)
+async def add_records_bulk(request: Request, commons: CommonDependencies = Depends()):
+    """
+    Bulk ingestion of sensor readings without photos.
+
+    Body is a JSON array, or NDJSON (one object per line) with
+    Content-Type: application/x-ndjson. Each item carries its own seedbed_id,
+    so one request may cover many seedbeds. No AI analysis is triggered.
+    """
+    db: AsyncSession = commons.db
+    records_service = RecordsService(db)
+
+    body = await request.body()
+    try:
+        items = parse_bulk_body(body, request.headers.get("content-type", ""))
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False)[:20]
+        )
+
+    if not items:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Пустой список записей")
+    if len(items) > settings.BULK_RECORDS_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Слишком много записей, максимум {settings.BULK_RECORDS_MAX_ROWS}"
+        )
+
+    try:
+        seedbed_ids = await records_service.bulk_insert_records(items)
+        return {"inserted": len(items), "seedbed_ids": seedbed_ids}
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except IntegrityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Ошибка при добавлении записей: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Ошибка при добавлении записей: {str(e)}"
+        )
+
+@router.get("/jobs/{job_id}", response_model=RecordJobResponse)
+async def get_record_job(job_id: UUID, commons: CommonDependencies = Depends()):
+    db: AsyncSession = commons.db
+    records_service = RecordsService(db)
+
+    job = await records_service.get_analysis_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Задача не найдена"
+        )
+    return job
+
 @router.get("/analytics/{seedbed_id}", response_model=RecordAnalytics)
 async def analytics(seedbed_id: int, commons: CommonDependencies = Depends()):
     db: AsyncSession = commons.db   
     records_service = RecordsService(db)
-    return await records_service.record_analytics_all_seedbeds(seedbed_id)
\ No newline at end of file
+    return await records_service.record_analytics_all_seedbeds(seedbed_id)
+
+@router.get("/stats/{seedbed_id}", response_model=RecordStats)
+async def get_record_stats(
+    seedbed_id: int = Path(..., ge=1, description="ID почвы"),
+    commons: CommonDependencies = Depends()
+):
+    db: AsyncSession = commons.db
+    records_service = RecordsService(db)
+
+    try:
+        return await records_service.get_record_stats(seedbed_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Ошибка при расчёте статистики: {str(e)}"
+        )
+
+@router.get("/summary/{seedbed_id}", response_model=SeedbedSummaryResponse)
+async def get_seedbed_summary(
+    seedbed_id: int = Path(..., ge=1, description="ID почвы"),
+    commons: CommonDependencies = Depends()
+):
+    db: AsyncSession = commons.db
+    records_service = RecordsService(db)
+
+    summary = await records_service.get_seedbed_summary(seedbed_id)
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Записи для этой грядки не найдены"
+        )
+    return summary
+
+@router.get("/series/{seedbed_id}", response_model=RecordSeries, response_model_by_alias=True)
+async def get_record_series(
+    seedbed_id: int = Path(..., ge=1, description="ID почвы"),
+    start: Optional[datetime] = Query(None, alias="from", description="Начало периода, по умолчанию to - 7 дней"),
+    end: Optional[datetime] = Query(None, alias="to", description="Конец периода, по умолчанию сейчас"),
+    bucket: str = Query("1h", description="Ширина интервала: 15m, 1h, 1d ..."),
+    commons: CommonDependencies = Depends()
+):
+    db: AsyncSession = commons.db
+    records_service = RecordsService(db)
+
+    try:
+        bucket_width = parse_bucket(bucket)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # records.created_at is a naive local timestamp.
+    if end and end.tzinfo:
+        end = end.astimezone().replace(tzinfo=None)
+    if start and start.tzinfo:
+        start = start.astimezone().replace(tzinfo=None)
+    end = end or datetime.now()
+    start = start or end - timedelta(days=7)
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Параметр from должен быть раньше to"
+        )
+    if (end - start) / bucket_width > settings.RECORD_SERIES_MAX_POINTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Слишком много интервалов, максимум {settings.RECORD_SERIES_MAX_POINTS}: увеличьте bucket"
+        )
+
+    try:
+        points = await records_service.get_record_series(seedbed_id, start, end, bucket_width)
+        return RecordSeries(seedbed_id=seedbed_id, start=start, end=end, bucket=bucket, points=points)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Ошибка при получении временного ряда: {str(e)}"
+        )
\ No newline at end of file
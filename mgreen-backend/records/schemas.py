@@ -1,6 +1,6 @@
 from datetime import datetime
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from typing import Optional, List, Dict
 import uuid
 import base64
 import re
@@ -15,6 +15,19 @@ class RecordsBase(BaseModel):
     height_plant: float = Field(None, description="Высота растения")
     photo_link: Optional[str] = Field(None, description="Фотография в формате base64")
     
+class BulkRecordItem(BaseModel):
+    seedbed_id: int = Field(..., ge=1, description="ID почвы")
+    water_temperature: float = Field(..., description="Температура воды")
+    air_temperature: float = Field(..., description="Температура воздуха")
+    air_humidity: float = Field(..., description="Влажность воздуха")
+    light_level: float = Field(..., description="Уровень света")
+    height_plant: Optional[float] = Field(None, description="Высота растения")
+    created_at: Optional[datetime] = Field(None, description="Время показания, по умолчанию время приёма")
+
+class BulkRecordsResponse(BaseModel):
+    inserted: int = Field(..., description="Количество добавленных записей")
+    seedbed_ids: List[int] = Field(..., description="ID грядок, в которые добавлены записи")
+
 class RecordsResponse(RecordsBase):
     id: int = Field(..., description="ID записи")
     created_at: datetime = Field(..., description="Дата создания записи")
@@ -25,13 +38,29 @@ class RecordsResponse(RecordsBase):
 
 class AddRecordResponse(BaseModel):
     message: str
+    job_id: uuid.UUID = Field(..., description="ID задачи анализа")
+    status: str = Field(..., description="Статус задачи анализа")
     record: RecordsResponse
 
+class RecordJobResponse(BaseModel):
+    id: uuid.UUID = Field(..., description="ID задачи анализа")
+    record_id: int = Field(..., description="ID записи")
+    seedbed_id: int = Field(..., description="ID почвы")
+    status: str = Field(..., description="Статус: queued, running, done или failed")
+    result: Optional[str] = Field(None, description="Результат анализа")
+    error: Optional[str] = Field(None, description="Ошибка анализа")
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 class GetAllRecordsResponse(BaseModel):
     records: List[RecordsResponse]
-    page: int
     page_size: int
-    page_count: int
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы, null на последней")
+    total_count: Optional[int] = Field(None, description="Только при include_total=true")
+    page_count: Optional[int] = Field(None, description="Только при include_total=true")
 
 class RecordsWithSoilResponse(BaseModel):
     id: int
@@ -40,7 +69,7 @@ class RecordsWithSoilResponse(BaseModel):
     air_humidity: float
     light_level: float
     height_plant: float
-    photo_link: str
+    photo_link: Optional[str] = None
     created_at: datetime
     soilId: int
     soil: SeedbedResponseFull
@@ -49,4 +78,63 @@ class RecordsWithSoilResponse(BaseModel):
         from_attributes = True
 
 class RecordAnalytics(BaseModel):
-    message: str
\ No newline at end of file
+    message: str
+
+class RecordMetricStats(BaseModel):
+    mean: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    last: Optional[float] = None
+    slope_per_day: Optional[float] = Field(None, description="Наклон тренда за последние window_days дней")
+
+class RecordStats(BaseModel):
+    seedbed_id: int
+    count: int = Field(..., description="Количество записей")
+    first_at: Optional[datetime] = None
+    last_at: Optional[datetime] = None
+    window_days: int = Field(..., description="Окно для расчёта трендов, дней")
+    metrics: Dict[str, RecordMetricStats] = {}
+    height_growth_cm_per_day: Optional[float] = Field(None, description="Скорость роста за всю историю, см/день")
+    recent_height_growth_cm_per_day: Optional[float] = Field(None, description="Скорость роста за окно, см/день")
+    out_of_range_share: Dict[str, float] = Field({}, description="Доля показаний вне идеального диапазона")
+
+
+class SummaryMetricStats(BaseModel):
+    count: int
+    mean: Optional[float] = None
+    std: Optional[float] = None
+    last: Optional[float] = None
+
+class SeedbedSummaryResponse(BaseModel):
+    seedbed_id: int
+    record_count: int = Field(..., description="Количество записей")
+    metrics: Dict[str, SummaryMetricStats] = {}
+    last_record_id: Optional[int] = None
+    last_record_at: Optional[datetime] = None
+    last_analysis: Optional[str] = None
+    last_analysis_at: Optional[datetime] = None
+
+
+class SeriesAggregate(BaseModel):
+    avg: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+class SeriesPoint(BaseModel):
+    bucket_start: datetime
+    count: int
+    water_temperature: SeriesAggregate
+    air_temperature: SeriesAggregate
+    air_humidity: SeriesAggregate
+    light_level: SeriesAggregate
+    height_plant: SeriesAggregate
+
+class RecordSeries(BaseModel):
+    seedbed_id: int
+    start: datetime = Field(..., alias="from")
+    end: datetime = Field(..., alias="to")
+    bucket: str
+    points: List[SeriesPoint]
+
+    class Config:
+        populate_by_name = True
@@ -0,0 +1,73 @@
+import re
+from datetime import datetime, timedelta
+from sqlalchemy import Integer, cast, func, select, union_all
+from .models import Records, RecordRollup
+from .rollups import rollup_series_query
+from .stats import SENSOR_COLUMNS
+
+_BUCKET_PATTERN = re.compile(r"^(\d+)([mhd])$")
+_BUCKET_UNITS = {"m": "minutes", "h": "hours", "d": "days"}
+
+# Fixed origin so buckets line up the same way for every request.
+BUCKET_ORIGIN = datetime(2000, 1, 1)
+
+
+def parse_bucket(bucket: str) -> timedelta:
+    """Parse a bucket width such as '15m', '1h' or '1d'."""
+    match = _BUCKET_PATTERN.match(bucket.strip())
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"Invalid bucket '{bucket}', expected e.g. 15m, 1h or 1d")
+    amount, unit = match.groups()
+    return timedelta(**{_BUCKET_UNITS[unit]: int(amount)})
+
+
+def series_query(seedbed_id: int, start: datetime, end: datetime, bucket: timedelta):
+    """
+    Per-bucket count/avg/min/max of every sensor, aggregated in Postgres.
+
+    Raw records (served by the records(soilId, created_at, id) index) are merged
+    with compacted rollups, so old ranges are read from records_rollup. Rollups
+    are never finer than their own hour/day granularity.
+    """
+    raw_columns = [
+        func.date_bin(bucket, Records.created_at, BUCKET_ORIGIN).label("bucket_start"),
+        func.count().label("count"),
+        func.count(Records.height_plant).label("height_plant_count"),
+    ]
+    for column in SENSOR_COLUMNS:
+        value = getattr(Records, column)
+        raw_columns += [
+            func.sum(value).label(f"{column}_sum"),
+            func.min(value).label(f"{column}_min"),
+            func.max(value).label(f"{column}_max"),
+        ]
+    raw = (
+        select(*raw_columns)
+        .where(
+            Records.soilId == seedbed_id,
+            Records.created_at >= start,
+            Records.created_at < end
+        )
+        .group_by(raw_columns[0])
+    )
+    rollups = rollup_series_query(
+        seedbed_id, start, end,
+        func.date_bin(bucket, RecordRollup.bucket_start, BUCKET_ORIGIN)
+    )
+    parts = union_all(raw, rollups).subquery()
+
+    count = func.sum(parts.c.count)
+    aggregates = []
+    for column in SENSOR_COLUMNS:
+        column_count = func.sum(parts.c.height_plant_count) if column == "height_plant" else count
+        aggregates += [
+            (func.sum(parts.c[f"{column}_sum"]) / func.nullif(column_count, 0)).label(f"{column}_avg"),
+            func.min(parts.c[f"{column}_min"]).label(f"{column}_min"),
+            func.max(parts.c[f"{column}_max"]).label(f"{column}_max"),
+        ]
+
+    return (
+        select(parts.c.bucket_start, cast(count, Integer).label("count"), *aggregates)
+        .group_by(parts.c.bucket_start)
+        .order_by(parts.c.bucket_start)
+    )
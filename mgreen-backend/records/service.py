@@ -1,75 +1,91 @@
 import logging
+import asyncpg
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, text, tuple_, union_all
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from database import get_db
 import base64
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple, List
-from .models import Records
+from uuid import UUID
+from .models import Records, RecordJob
 import json
 from plants.models import Plants, PlantsType
 from sqlalchemy.orm import joinedload
 from fastapi import HTTPException
-from .schemas import RecordsBase, RecordAnalytics, RecordsWithSoilResponse
+from .schemas import RecordsBase, RecordAnalytics, RecordsWithSoilResponse, RecordStats, SeedbedSummaryResponse, SeriesAggregate, SeriesPoint, BulkRecordItem
+from .stats import STATS_COLUMNS, SENSOR_COLUMNS, compute_record_features, format_features
+from .series import series_query
+from .rollups import rollup_stats_query
+from .write_buffer import record_write_buffer
+from .summary import apply_records_to_summary, get_summary, summary_to_response, format_summary
 from seedbeds.models import Seedbeds
 from seedbeds.services import SeedbedsService
 from seedbeds.schemas import SeedbedResponseFull
 from llm.request import LLMRequest
+from llm.prompt_builder import RecordsPromptBuilder
+from core.config import settings
+from core.pagination import encode_cursor, decode_cursor
 from llm.schemas import LLMTemperature, AIModelType
 from utils.logger import logger
-from core.ai_config import OPENAI_CLIENT
-from utils.kafka_client import KafkaProducer 
+from utils.image_processing import image_digest, prepare_image
+from .analysis_cache import vision_cache_key, get_cached_analysis, set_cached_analysis
+from core.ai_config import get_openai_client
+from utils.kafka_client import KafkaProducer, kafka_producer as shared_kafka_producer
 from integration.services import Integrations
 
 class RecordsService():
-    def __init__(self, db: AsyncSession):
-        self.kafka_producer = KafkaProducer()
+    def __init__(self, db: AsyncSession, kafka_producer: KafkaProducer = shared_kafka_producer):
+        self.kafka_producer = kafka_producer
         self.db = db
-        self.integration_service = Integrations(self.db)
-        self.client = OPENAI_CLIENT
+        self.integration_service = Integrations(self.db, kafka_producer)
+        self.client = get_openai_client()
 
     async def get_all_records_by_id(
         self,
         seedbed_id: int,
-        page: int = 1,
-        page_size: int = 10
-    ) -> Tuple[List[Records], int]:
+        cursor: Optional[str] = None,
+        page_size: int = 10,
+        include_total: bool = False
+    ) -> Tuple[List[Records], Optional[str], Optional[int]]:
         try:
-            offset = (page - 1) * page_size
-            
-            query = select(Records).where(Records.soilId == seedbed_id).offset(offset).limit(page_size)
+            query = (
+                select(Records)
+                .where(Records.soilId == seedbed_id)
+                .order_by(Records.created_at.desc(), Records.id.desc())
+                .limit(page_size + 1)
+            )
+
+            after = decode_cursor(cursor, (datetime.fromisoformat, int))
+            if after:
+                query = query.where(tuple_(Records.created_at, Records.id) < after)
+
             result = await self.db.execute(query)
             records = result.scalars().all()
 
-            count_query = select(func.count()).select_from(Records).where(Records.soilId == seedbed_id)
-            count_result = await self.db.execute(count_query)
-            total_count = count_result.scalar()
+            next_cursor = None
+            if len(records) > page_size:
+                records = records[:page_size]
+                next_cursor = encode_cursor([records[-1].created_at, records[-1].id])
 
-            return records, total_count
+            total_count = None
+            if include_total:
+                count_query = select(func.count()).select_from(Records).where(Records.soilId == seedbed_id)
+                count_result = await self.db.execute(count_query)
+                total_count = count_result.scalar()
+
+            return records, next_cursor, total_count
             
         except SQLAlchemyError as e:
             logging.error(f"Ошибка при получении записей: {str(e)}")
             raise e
         
 
-    async def llm_request_record(self, seedbed: SeedbedResponseFull, record: RecordsBase):
+    async def llm_request_record(self, seedbed: SeedbedResponseFull, record: RecordsBase, image: bytes):
         try:
-            image_str = record.photo_link
-            
-            if not image_str:
+            if not image:
                 logger.error("Missing image data")
                 raise ValueError("Image data is required for analysis")
-
-            if not image_str.startswith("data:image/"):
-                raise HTTPException(status_code=400, detail="Invalid image format")
-            
-            try:
-                header, base64_data = image_str.split(",", 1)
-                image = base64.b64decode(base64_data)
-            except Exception as e:
-                logger.error(f"Failed to decode base64 image: {str(e)}")
-                raise ValueError(f"Invalid base64 image data: {str(e)}")
             
             if not hasattr(self, 'client') or self.client is None:
                 logger.error("LLM client is not initialized")
@@ -126,7 +142,21 @@ class RecordsService():
             prompt = "Provide a complete analysis of the microgreens shown in this image based on the provided data."
 
             try:
-                response_text = await llm.send_with_image(image, prompt)
+                # Keyed on the raw upload so a repeat skips decoding and resizing entirely.
+                cache_key = vision_cache_key(seedbed, record, await image_digest(image))
+                cached = await get_cached_analysis(cache_key)
+                if cached is not None:
+                    logger.info(f"Vision analysis cache hit for seedbed {seedbed.id}")
+                    return cached
+
+                prepared = await prepare_image(image)
+
+                response_text = await llm.send_with_image(
+                    prepared.data,
+                    prompt,
+                    mime_type=prepared.mime_type,
+                    detail=prepared.detail
+                )
                 logger.info("Received LLM response, processing results")
                 
                 if "```json" in response_text:
@@ -142,6 +172,7 @@ class RecordsService():
                     if "message" not in response_data:
                         raise ValueError("Missing required 'message' field in response")
                     
+                    await set_cached_analysis(cache_key, response_data)
                     return response_data
                     
                 except json.JSONDecodeError as e:
@@ -160,7 +191,12 @@ class RecordsService():
                 detail=f"Image processing error: {str(e)}"
             )
         
-    async def record_push_notification(self, full_message: str, time: datetime):
+    async def record_push_notification(
+        self,
+        full_message: str,
+        time: datetime,
+        telegram_ids: Optional[List[int]] = None
+    ):
         try:
             llm = LLMRequest(
                 client=self.client,
@@ -182,23 +218,18 @@ You are a cheerful assistant tasked with creating short, fun, and engaging push
             if len(push_notification) > 100:
                 push_notification = push_notification[:97] + "..."  
 
-            telegrams = await self.integration_service.get_all_telegram_integrations()
+            if telegram_ids is None:
+                telegrams = await self.integration_service.get_all_telegram_integrations()
+                telegram_ids = [telegram.telegram_id for telegram in telegrams]
 
-            for telegram in telegrams:
-                telegram_id = telegram.telegram_id  
-                await self.kafka_producer.send_message(
-                    telegram_id=telegram_id,
-                    message=push_notification,
-                    deliver_at=time
-                )
-                print("Scheduled push notification for Telegram ID {telegram_id} at {time}: {push_notification}")
-                logger.info(f"Scheduled push notification for Telegram ID {telegram_id} at {time}: {push_notification}")
+            await self.kafka_producer.send_notification(telegram_ids, push_notification, deliver_at=time)
+            logger.info(f"Scheduled push notification for {len(telegram_ids)} Telegram IDs at {time}: {push_notification}")
 
         except Exception as e:
             logger.error(f"Error in record_push_notification: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Failed to send push notification: {str(e)}")
         
-    async def record_analytics(self, records: RecordsBase, seedbed_id: int):
+    async def record_analytics(self, records: RecordsBase, seedbed_id: int, image: bytes):
         try: 
             seedbeds_service = SeedbedsService(self.db)
             seedbed_dict = await seedbeds_service.get_seedbed_by_id(seedbed_id)
@@ -211,7 +242,7 @@ You are a cheerful assistant tasked with creating short, fun, and engaging push
             if not seedbed:
                 raise ValueError(f"Seedbed with ID {seedbed_id} not found")
             
-            response = await self.llm_request_record(seedbed, records)
+            response = await self.llm_request_record(seedbed, records, image)
             
             if response.get('day_when_harvest'):
                 try:
@@ -226,21 +257,24 @@ You are a cheerful assistant tasked with creating short, fun, and engaging push
                     logger.error(f"Failed to update harvest date: {str(update_error)}")
             
                 if response.get('message'):
-                    await self.kafka_producer.start()
                     telegrams = await self.integration_service.get_all_telegram_integrations()
+                    telegram_ids = [telegram.telegram_id for telegram in telegrams]
                     full_message = f"""Record created:\n- Water Temperature: {records.water_temperature}°C\n- Air Temperature: {records.air_temperature}°C\n- Air Humidity: {records.air_humidity}%\n- Light Level: {records.light_level} lux\n- Plant Height: {records.height_plant} cm\n{response.get('message')}"""
-                    for telegram in telegrams:
-                        telegram_id = telegram.telegram_id
+                    if telegram_ids:
                         now_utc = datetime.now(timezone.utc)
                         full_msg_time = now_utc + timedelta(seconds=10)
-                        await self.kafka_producer.send_message(telegram_id, full_message, deliver_at=full_msg_time)
-                        logger.info(f"Scheduled full message for {telegram_id} at {full_msg_time.isoformat()}Z (UTC)")
+                        await self.kafka_producer.send_notification(telegram_ids, full_message, deliver_at=full_msg_time)
+                        logger.info(f"Scheduled full message for {len(telegram_ids)} Telegram IDs at {full_msg_time.isoformat()}Z (UTC)")
 
+                        # One push notification (and one LLM call) for all recipients.
                         notification_time = now_utc + timedelta(minutes=1)
                         logger.info(f"Harvest: {harvest_date.isoformat()}Z, Notification: {notification_time.isoformat()}Z (UTC)")
                         if harvest_date > notification_time:
-                            await self.record_push_notification(full_message=full_message, time=notification_time)
-                    await self.kafka_producer.stop()
+                            await self.record_push_notification(
+                                full_message=full_message,
+                                time=notification_time,
+                                telegram_ids=telegram_ids
+                            )
                     return response.get('message')
             else:
                 return "Analysis completed, but no specific recommendations available"
@@ -258,61 +292,101 @@ You are a cheerful assistant tasked with creating short, fun, and engaging push
                 detail=f"Failed to analyze plant data: {str(e)}"
             )
         
+    def _stats_query(self, seedbed_id: int, since: Optional[datetime] = None):
+        """Raw records plus compacted rollup buckets (one averaged row each), oldest first."""
+        raw = (
+            select(*(getattr(Records, column) for column in STATS_COLUMNS))
+            .where(Records.soilId == seedbed_id)
+        )
+        if since is not None:
+            raw = raw.where(Records.created_at >= since)
+        rows = union_all(raw, rollup_stats_query(seedbed_id, since)).subquery()
+        return select(*(rows.c[column] for column in STATS_COLUMNS)).order_by(rows.c.created_at)
+
+    async def get_record_series(
+        self,
+        seedbed_id: int,
+        start: datetime,
+        end: datetime,
+        bucket: timedelta
+    ) -> List[SeriesPoint]:
+        try:
+            result = await self.db.execute(series_query(seedbed_id, start, end, bucket))
+            points = []
+            for row in result.mappings().all():
+                point = {"bucket_start": row["bucket_start"], "count": row["count"]}
+                for column in SENSOR_COLUMNS:
+                    point[column] = SeriesAggregate(
+                        avg=row[f"{column}_avg"],
+                        min=row[f"{column}_min"],
+                        max=row[f"{column}_max"]
+                    )
+                points.append(SeriesPoint(**point))
+            return points
+
+        except SQLAlchemyError as e:
+            logging.error(f"Ошибка при получении временного ряда: {str(e)}")
+            raise e
+
+    async def get_seedbed_summary(self, seedbed_id: int) -> Optional[SeedbedSummaryResponse]:
+        summary = await get_summary(self.db, seedbed_id)
+        if not summary:
+            return None
+        return summary_to_response(summary)
+
+    async def get_record_stats(self, seedbed_id: int) -> RecordStats:
+        try:
+            result = await self.db.execute(self._stats_query(seedbed_id))
+            rows = result.all()
+            return compute_record_features(seedbed_id, rows, settings.RECORD_STATS_WINDOW_DAYS)
+
+        except SQLAlchemyError as e:
+            logging.error(f"Ошибка при расчёте статистики записей: {str(e)}")
+            raise e
+
     async def record_analytics_all_seedbeds(self, seedbed_id: int) -> RecordAnalytics:
         try:
-            query = (
-                select(Records, Seedbeds, Plants, PlantsType)
-                .select_from(Records)
-                .join(Seedbeds, Records.soilId == Seedbeds.id)
+            context_query = (
+                select(Seedbeds, Plants, PlantsType)
                 .join(Plants, Seedbeds.plant_id == Plants.id)
                 .join(PlantsType, Plants.plant_type_id == PlantsType.id)
-                .where(Records.soilId == seedbed_id)
+                .where(Seedbeds.id == seedbed_id)
             )
-            result = await self.db.execute(query)
-            rows = result.all()
+            context_result = await self.db.execute(context_query)
+            context_row = context_result.first()
+
+            summary = await get_summary(self.db, seedbed_id)
 
-            if not rows:
+            if not context_row or not summary or not summary.record_count:
                 return RecordAnalytics(message="No records found for this seedbed.")
 
-            records_data = []
-            for record, seedbed, plant, plant_type in rows:
-                record_dict = {
-                    "id": record.id,
-                    "water_temperature": record.water_temperature,
-                    "air_temperature": record.air_temperature,
-                    "air_humidity": record.air_humidity,
-                    "light_level": record.light_level,
-                    "height_plant": record.height_plant,
-                    "photo_link": record.photo_link,
-                    "created_at": record.created_at.isoformat(),
-                    "soilId": record.soilId,
-                    "soil": {
-                        "id": seedbed.id,
-                        "soil_number": seedbed.soil_number,
-                        "plant_id": str(seedbed.plant_id),
-                        "type_of_soil": seedbed.type_of_soil,
-                        "date_planted": seedbed.date_planted.isoformat(),
-                        "date_harvested": seedbed.date_harvested.isoformat() if seedbed.date_harvested else None,
-                        "plant_name": plant.name,
-                        "plant": {
-                            "id": str(plant.id),
-                            "name": plant.name,
-                            "typical_days_to_harvest": plant.typical_days_to_harvest,
-                            "description": plant.description,
-                            "plant_type_id": str(plant.plant_type_id),
-                            "created_at": plant.created_at.isoformat(),
-                            "updated_at": plant.updated_at.isoformat() if plant.updated_at else None,
-                            "plant_type": {
-                                "id": str(plant_type.id),
-                                "name": plant_type.name,
-                                "description": plant_type.description,
-                                "created_at": plant_type.created_at.isoformat(),
-                                "updated_at": plant_type.updated_at.isoformat() if plant_type.updated_at else None,
-                            }
-                        }
-                    }
-                }
-                records_data.append(record_dict)
+            # Only the recent window is read from `records`; all-time aggregates
+            # come from the summary row.
+            since = summary.last_record_at - timedelta(days=settings.RECORD_STATS_WINDOW_DAYS)
+            records_result = await self.db.execute(self._stats_query(seedbed_id, since))
+            rows = records_result.all()
+
+            seedbed, plant, plant_type = context_row
+            context = {
+                "soil_number": seedbed.soil_number,
+                "type_of_soil": seedbed.type_of_soil,
+                "date_planted": seedbed.date_planted.isoformat(),
+                "date_harvested": seedbed.date_harvested.isoformat() if seedbed.date_harvested else None,
+                "plant_name": plant.name,
+                "plant_type": plant_type.name,
+                "typical_days_to_harvest": plant.typical_days_to_harvest,
+                "plant_description": plant.description,
+            }
+
+            prompt_builder = RecordsPromptBuilder(
+                token_budget=settings.ANALYTICS_PROMPT_TOKEN_BUDGET,
+                model=AIModelType.GPT4OMINI
+            )
+            records_data = prompt_builder.build(
+                context, [dict(zip(STATS_COLUMNS, row)) for row in rows]
+            )
+            stats = compute_record_features(seedbed_id, rows, settings.RECORD_STATS_WINDOW_DAYS)
+            features = format_summary(summary_to_response(summary)) + "\n\n" + format_features(stats)
 
             llm = LLMRequest(
                 client=self.client,
@@ -321,12 +395,13 @@ You are a cheerful assistant tasked with creating short, fun, and engaging push
             )
 
             sys_prompt = """
-You are an expert agronomist analyzing microgreen growth records for a seedbed. Below are records with environmental conditions, plant height, and soil/plant details. Analyze trends (e.g., temperature, humidity, light changes), assess plant health and growth stage relative to the plant's typical_days_to_harvest, and note suboptimal conditions (ideal: 18-24°C, 50-70% humidity, 1000-5000 lux for microgreens). Provide a concise, actionable summary (max 100 words) with suggestions or confirmation of healthy growth.
+You are an expert agronomist analyzing microgreen growth records for a seedbed. Below are the seedbed/plant details followed by a table of records with environmental conditions and plant height (water/air temperature in °C, humidity in %, light in lux, height in cm). Analyze trends (e.g., temperature, humidity, light changes), assess plant health and growth stage relative to the plant's typical_days_to_harvest, and note suboptimal conditions (ideal: 18-24°C, 50-70% humidity, 1000-5000 lux for microgreens). Provide a concise, actionable summary (max 100 words) with suggestions or confirmation of healthy growth.
+
+{features}
 
-RECORDS:
 {records_data}
 """
-            llm.add_system_message(sys_prompt.format(records_data=records_data))
+            llm.add_system_message(sys_prompt.format(features=features, records_data=records_data))
 
             response = await llm.send("Analyze the records and provide insights.")
 
@@ -345,6 +420,17 @@ RECORDS:
         records: RecordsBase,
         seedbed_id: int
     ) -> Optional[Records]:
+        if record_write_buffer.running:
+            return await record_write_buffer.add({
+                "water_temperature": records.water_temperature,
+                "air_temperature": records.air_temperature,
+                "air_humidity": records.air_humidity,
+                "light_level": records.light_level,
+                "height_plant": records.height_plant,
+                "photo_link": records.photo_link,
+                "soilId": seedbed_id,
+            })
+
         try:           
             new_record = Records(
                 water_temperature=records.water_temperature,
@@ -357,6 +443,8 @@ RECORDS:
             )
             
             self.db.add(new_record)
+            await self.db.flush()
+            await apply_records_to_summary(self.db, [new_record])
             await self.db.commit()
             await self.db.refresh(new_record)
             
@@ -370,4 +458,92 @@ RECORDS:
         except SQLAlchemyError as e:
             logging.error(f"Ошибка при добавлении записи: {str(e)}")
             await self.db.rollback()
-            raise e
\ No newline at end of file
+            raise e
+
+    async def bulk_insert_records(self, items: List[BulkRecordItem]) -> List[int]:
+        """
+        Insert photo-less sensor readings for one or many seedbeds in one transaction
+        with asyncpg COPY. No LLM call is made.
+        """
+        try:
+            seedbed_ids = sorted({item.seedbed_id for item in items})
+            existing = await self.db.execute(select(Seedbeds.id).where(Seedbeds.id.in_(seedbed_ids)))
+            missing = set(seedbed_ids) - set(existing.scalars().all())
+            if missing:
+                raise ValueError(f"Грядки не найдены: {sorted(missing)}")
+
+            # Ids are reserved up front so COPY can write them and the summaries
+            # can point at the real last record.
+            ids_result = await self.db.execute(
+                text("SELECT nextval(pg_get_serial_sequence('records', 'id')) FROM generate_series(1, :n)"),
+                {"n": len(items)}
+            )
+            ids = ids_result.scalars().all()
+
+            now = datetime.now()
+            rows = []
+            for record_id, item in zip(ids, items):
+                created_at = item.created_at
+                if created_at is None:
+                    created_at = now
+                elif created_at.tzinfo:
+                    created_at = created_at.astimezone().replace(tzinfo=None)
+                rows.append({
+                    "id": record_id,
+                    "soilId": item.seedbed_id,
+                    "water_temperature": item.water_temperature,
+                    "air_temperature": item.air_temperature,
+                    "air_humidity": item.air_humidity,
+                    "light_level": item.light_level,
+                    "height_plant": item.height_plant,
+                    "created_at": created_at,
+                })
+
+            columns = list(rows[0].keys())
+            connection = await self.db.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                Records.__tablename__,
+                records=[tuple(row[column] for column in columns) for row in rows],
+                columns=columns
+            )
+
+            await apply_records_to_summary(self.db, rows)
+            await self.db.commit()
+
+            return seedbed_ids
+
+        except asyncpg.IntegrityConstraintViolationError as e:
+            # COPY goes straight to asyncpg, so its errors are not wrapped by SQLAlchemy.
+            logging.error(f"Ошибка при массовом добавлении записей: {str(e)}")
+            await self.db.rollback()
+            raise ValueError(f"Нарушение ограничений данных: {str(e)}") from e
+
+        except (SQLAlchemyError, asyncpg.PostgresError) as e:
+            logging.error(f"Ошибка при массовом добавлении записей: {str(e)}")
+            await self.db.rollback()
+            raise e
+
+    async def create_analysis_job(self, record: Records, photo_key: str) -> RecordJob:
+        try:
+            job = RecordJob(
+                record_id=record.id,
+                seedbed_id=record.soilId,
+                photo_key=photo_key
+            )
+
+            self.db.add(job)
+            await self.db.commit()
+            await self.db.refresh(job)
+
+            return job
+
+        except SQLAlchemyError as e:
+            logging.error(f"Ошибка при создании задачи анализа: {str(e)}")
+            await self.db.rollback()
+            raise e
+
+    async def get_analysis_job(self, job_id: UUID) -> Optional[RecordJob]:
+        query = select(RecordJob).where(RecordJob.id == job_id)
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
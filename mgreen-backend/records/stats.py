@@ -0,0 +1,125 @@
+from typing import Dict, Optional, Sequence
+import numpy as np
+import pandas as pd
+from .schemas import RecordMetricStats, RecordStats
+
+SENSOR_COLUMNS = [
+    "water_temperature",
+    "air_temperature",
+    "air_humidity",
+    "light_level",
+    "height_plant",
+]
+
+STATS_COLUMNS = ["created_at", *SENSOR_COLUMNS]
+
+# Ideal ranges for microgreens, the same ones the analytics prompt uses.
+IDEAL_RANGES = {
+    "air_temperature": (18.0, 24.0),
+    "air_humidity": (50.0, 70.0),
+    "light_level": (1000.0, 5000.0),
+}
+
+_SECONDS_PER_DAY = 86400.0
+
+
+def _slope_per_day(days: np.ndarray, values: np.ndarray) -> Optional[float]:
+    """Least-squares slope of `values` over `days`, ignoring NaNs."""
+    mask = ~np.isnan(values)
+    if mask.sum() < 2:
+        return None
+    x = days[mask]
+    y = values[mask]
+    x_centered = x - x.mean()
+    denominator = float(np.dot(x_centered, x_centered))
+    if denominator == 0.0:
+        return None
+    return float(np.dot(x_centered, y - y.mean()) / denominator)
+
+
+def _round(value, digits: int = 4) -> Optional[float]:
+    if value is None or pd.isna(value):
+        return None
+    return round(float(value), digits)
+
+
+def compute_record_features(
+    seedbed_id: int,
+    rows: Sequence[Sequence],
+    window_days: int
+) -> RecordStats:
+    """
+    Turn raw record rows (in STATS_COLUMNS order) into summary features.
+
+    All per-metric aggregates are vectorized over the whole history; slopes are
+    computed over the last `window_days` days only.
+    """
+    if not rows:
+        return RecordStats(seedbed_id=seedbed_id, count=0, window_days=window_days)
+
+    df = pd.DataFrame.from_records(rows, columns=STATS_COLUMNS)
+    df["created_at"] = pd.to_datetime(df["created_at"])
+    df = df.sort_values("created_at", kind="stable")
+    values = df[SENSOR_COLUMNS].astype("float64")
+
+    days = (
+        (df["created_at"] - df["created_at"].iloc[0]).dt.total_seconds().to_numpy()
+        / _SECONDS_PER_DAY
+    )
+    window = days >= days[-1] - window_days
+
+    means = values.mean()
+    minimums = values.min()
+    maximums = values.max()
+    lasts = values.ffill().iloc[-1]
+
+    metrics: Dict[str, RecordMetricStats] = {}
+    for column in SENSOR_COLUMNS:
+        column_values = values[column].to_numpy()
+        metrics[column] = RecordMetricStats(
+            mean=_round(means[column]),
+            min=_round(minimums[column]),
+            max=_round(maximums[column]),
+            last=_round(lasts[column]),
+            slope_per_day=_round(_slope_per_day(days[window], column_values[window])),
+        )
+
+    out_of_range_share: Dict[str, float] = {}
+    for column, (low, high) in IDEAL_RANGES.items():
+        column_values = values[column].dropna()
+        if column_values.empty:
+            continue
+        outside = (column_values < low) | (column_values > high)
+        out_of_range_share[column] = round(float(outside.mean()), 4)
+
+    height = values["height_plant"].to_numpy()
+
+    return RecordStats(
+        seedbed_id=seedbed_id,
+        count=len(df),
+        first_at=df["created_at"].iloc[0].to_pydatetime(),
+        last_at=df["created_at"].iloc[-1].to_pydatetime(),
+        window_days=window_days,
+        metrics=metrics,
+        height_growth_cm_per_day=_round(_slope_per_day(days, height)),
+        recent_height_growth_cm_per_day=metrics["height_plant"].slope_per_day,
+        out_of_range_share=out_of_range_share,
+    )
+
+
+def format_features(stats: RecordStats) -> str:
+    """Compact text block of the features for the analytics prompt."""
+    lines = [
+        f"FEATURES ({stats.count} records, {stats.first_at:%Y-%m-%d} .. {stats.last_at:%Y-%m-%d}, "
+        f"slopes over last {stats.window_days} days):",
+        "metric|mean|min|max|last|slope/day",
+    ]
+    for column, metric in stats.metrics.items():
+        values = [metric.mean, metric.min, metric.max, metric.last, metric.slope_per_day]
+        lines.append("|".join([column, *("-" if v is None else f"{v:g}" for v in values)]))
+    if stats.height_growth_cm_per_day is not None:
+        lines.append(f"height growth: {stats.height_growth_cm_per_day:g} cm/day overall")
+    for column, share in stats.out_of_range_share.items():
+        low, high = IDEAL_RANGES[column]
+        lines.append(f"{column} outside {low:g}-{high:g}: {share:.0%} of readings")
+    return "\n".join(lines)
@@ -0,0 +1,145 @@
+import math
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from .models import SeedbedSummary
+from .schemas import SeedbedSummaryResponse, SummaryMetricStats
+from .stats import SENSOR_COLUMNS
+
+# Every sensor except the plant height is NOT NULL, so their count is record_count.
+_NULLABLE_SENSORS = {"height_plant"}
+
+
+def _aggregate(rows: Iterable) -> Dict[int, dict]:
+    """Fold record rows (ORM objects or mappings) into one summary delta per seedbed."""
+    deltas: Dict[int, dict] = {}
+    for row in rows:
+        get = row.get if isinstance(row, dict) else lambda name: getattr(row, name)
+        seedbed_id = get("soilId")
+        delta = deltas.get(seedbed_id)
+        if delta is None:
+            delta = {"seedbed_id": seedbed_id, "record_count": 0, "height_plant_count": 0}
+            for column in SENSOR_COLUMNS:
+                delta[f"{column}_sum"] = 0.0
+                delta[f"{column}_sumsq"] = 0.0
+                delta[f"{column}_last"] = None
+            delta["last_record_id"] = None
+            delta["last_record_at"] = None
+            deltas[seedbed_id] = delta
+
+        delta["record_count"] += 1
+        for column in SENSOR_COLUMNS:
+            value = get(column)
+            if value is None:
+                continue
+            if column in _NULLABLE_SENSORS:
+                delta[f"{column}_count"] += 1
+            delta[f"{column}_sum"] += value
+            delta[f"{column}_sumsq"] += value * value
+
+        record_key = (get("created_at"), get("id"))
+        if delta["last_record_at"] is None or record_key >= (delta["last_record_at"], delta["last_record_id"]):
+            delta["last_record_at"], delta["last_record_id"] = record_key
+            for column in SENSOR_COLUMNS:
+                value = get(column)
+                if value is not None or column not in _NULLABLE_SENSORS:
+                    delta[f"{column}_last"] = value
+    return deltas
+
+
+async def apply_records_to_summary(db: AsyncSession, rows: Iterable):
+    """
+    Add freshly inserted records to their seedbeds' summaries with one upsert per
+    seedbed. Runs on the caller's session so it commits together with the insert.
+    """
+    deltas = _aggregate(rows)
+    if not deltas:
+        return
+
+    stmt = insert(SeedbedSummary).values(list(deltas.values()))
+    excluded = stmt.excluded
+    is_newer = or_(
+        SeedbedSummary.last_record_at.is_(None),
+        and_(
+            excluded.last_record_at.is_not(None),
+            excluded.last_record_at >= SeedbedSummary.last_record_at
+        )
+    )
+
+    set_ = {
+        "record_count": SeedbedSummary.record_count + excluded.record_count,
+        "height_plant_count": SeedbedSummary.height_plant_count + excluded.height_plant_count,
+        "last_record_id": case((is_newer, excluded.last_record_id), else_=SeedbedSummary.last_record_id),
+        "last_record_at": case((is_newer, excluded.last_record_at), else_=SeedbedSummary.last_record_at),
+        "updated_at": datetime.now(),
+    }
+    for column in SENSOR_COLUMNS:
+        current = getattr(SeedbedSummary, column + "_last")
+        set_[f"{column}_sum"] = getattr(SeedbedSummary, column + "_sum") + excluded[f"{column}_sum"]
+        set_[f"{column}_sumsq"] = getattr(SeedbedSummary, column + "_sumsq") + excluded[f"{column}_sumsq"]
+        set_[f"{column}_last"] = case(
+            (is_newer, func.coalesce(excluded[f"{column}_last"], current)),
+            else_=current
+        )
+
+    await db.execute(
+        stmt.on_conflict_do_update(index_elements=[SeedbedSummary.seedbed_id], set_=set_)
+    )
+
+
+async def set_last_analysis(db: AsyncSession, seedbed_id: int, message: Optional[str]):
+    if not message:
+        return
+    await db.execute(
+        update(SeedbedSummary)
+        .where(SeedbedSummary.seedbed_id == seedbed_id)
+        .values(last_analysis=message, last_analysis_at=datetime.now())
+    )
+
+
+async def get_summary(db: AsyncSession, seedbed_id: int) -> Optional[SeedbedSummary]:
+    result = await db.execute(
+        select(SeedbedSummary).where(SeedbedSummary.seedbed_id == seedbed_id)
+    )
+    return result.scalar_one_or_none()
+
+
+def summary_to_response(summary: SeedbedSummary) -> SeedbedSummaryResponse:
+    metrics = {}
+    for column in SENSOR_COLUMNS:
+        count = summary.height_plant_count if column in _NULLABLE_SENSORS else summary.record_count
+        mean = std = None
+        if count:
+            total = getattr(summary, f"{column}_sum")
+            mean = total / count
+            variance = getattr(summary, f"{column}_sumsq") / count - mean * mean
+            std = math.sqrt(max(variance, 0.0))
+        metrics[column] = SummaryMetricStats(
+            count=count,
+            mean=round(mean, 4) if mean is not None else None,
+            std=round(std, 4) if std is not None else None,
+            last=getattr(summary, f"{column}_last"),
+        )
+
+    return SeedbedSummaryResponse(
+        seedbed_id=summary.seedbed_id,
+        record_count=summary.record_count,
+        metrics=metrics,
+        last_record_id=summary.last_record_id,
+        last_record_at=summary.last_record_at,
+        last_analysis=summary.last_analysis,
+        last_analysis_at=summary.last_analysis_at,
+    )
+
+
+def format_summary(summary: SeedbedSummaryResponse) -> str:
+    """All-time aggregates for the analytics prompt."""
+    lines = [f"ALL-TIME ({summary.record_count} records):", "metric|mean|std|last"]
+    for column, metric in summary.metrics.items():
+        values = [metric.mean, metric.std, metric.last]
+        lines.append("|".join([column, *("-" if v is None else f"{v:g}" for v in values)]))
+    if summary.last_analysis:
+        lines.append(f"Previous analysis: {summary.last_analysis}")
+    return "\n".join(lines)
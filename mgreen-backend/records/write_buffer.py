@@ -0,0 +1,150 @@
+import asyncio
+from typing import List, Optional, Tuple
+from sqlalchemy import insert, text
+from sqlalchemy.exc import IntegrityError
+from database import SessionLocal
+from core.config import settings
+from utils.logger import logger
+from utils.metrics import metrics
+from .models import Records
+from .summary import apply_records_to_summary
+
+_SYNCHRONOUS_COMMIT_LEVELS = {"on", "off", "local", "remote_write", "remote_apply"}
+
+_Pending = Tuple[dict, asyncio.Future]
+
+
+class RecordWriteBuffer:
+    """
+    Write-behind buffer for single record inserts.
+
+    Callers hand over the column values and wait on a future. A single writer task
+    collects rows for up to `max_delay_ms` or `max_rows`, inserts them with one
+    INSERT ... RETURNING, updates the seedbed summaries in the same transaction and
+    resolves every future with its own row once the transaction is committed.
+    """
+
+    def __init__(
+        self,
+        max_rows: int = settings.RECORD_WRITE_BUFFER_MAX_ROWS,
+        max_delay_ms: int = settings.RECORD_WRITE_BUFFER_MAX_DELAY_MS,
+        synchronous_commit: Optional[str] = settings.RECORD_WRITE_BUFFER_SYNCHRONOUS_COMMIT
+    ):
+        if synchronous_commit and synchronous_commit not in _SYNCHRONOUS_COMMIT_LEVELS:
+            raise ValueError(f"Unsupported synchronous_commit level: {synchronous_commit}")
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self.synchronous_commit = synchronous_commit
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    async def start(self):
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._writer(), name="record-write-buffer")
+        logger.info(
+            f"Record write buffer started (max_rows={self.max_rows}, "
+            f"max_delay={self.max_delay * 1000:g}ms, synchronous_commit={self.synchronous_commit})"
+        )
+
+    async def stop(self):
+        """Flush everything already buffered, then stop the writer."""
+        if not self.running:
+            return
+        await self.queue.put(None)
+        await self.task
+        self.task = None
+        logger.info("Record write buffer stopped")
+
+    async def add(self, values: dict) -> Records:
+        if not self.running:
+            raise RuntimeError("Record write buffer not started. Call start() first.")
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((values, future))
+        return await future
+
+    async def _writer(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self.queue.get()
+            if item is None:
+                break
+
+            batch: List[_Pending] = [item]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+        # Rows that raced with the stop sentinel are still written.
+        leftover = []
+        while not self.queue.empty():
+            item = self.queue.get_nowait()
+            if item is not None:
+                leftover.append(item)
+        for start in range(0, len(leftover), self.max_rows):
+            await self._flush(leftover[start:start + self.max_rows])
+
+    async def _flush(self, batch: List[_Pending]):
+        try:
+            with metrics.timer("records.write_buffer.flush"):
+                rows = await self._insert([values for values, _ in batch])
+            metrics.incr("records.write_buffer.rows", len(batch))
+        except IntegrityError as e:
+            if len(batch) == 1:
+                self._fail(batch, e)
+                return
+            # One bad row (e.g. an unknown seedbed) must not fail its neighbours.
+            logger.warning(f"Record write buffer batch of {len(batch)} failed, retrying row by row")
+            for pending in batch:
+                await self._flush([pending])
+            return
+        except Exception as e:
+            logger.error(f"Record write buffer flush failed: {str(e)}")
+            self._fail(batch, e)
+            return
+
+        for (_, future), row in zip(batch, rows):
+            if not future.done():
+                future.set_result(row)
+
+    async def _insert(self, values: List[dict]) -> List[Records]:
+        async with SessionLocal() as db:
+            try:
+                if self.synchronous_commit:
+                    await db.execute(text(f"SET LOCAL synchronous_commit = {self.synchronous_commit}"))
+                result = await db.execute(
+                    insert(Records).returning(Records, sort_by_parameter_order=True),
+                    values
+                )
+                rows = result.scalars().all()
+                await apply_records_to_summary(db, rows)
+                await db.commit()
+                return rows
+            except Exception:
+                await db.rollback()
+                raise
+
+    @staticmethod
+    def _fail(batch: List[_Pending], error: Exception):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+
+record_write_buffer = RecordWriteBuffer()
@@ -1,12 +1,15 @@
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import TIMESTAMP, String, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy import TIMESTAMP, String, Integer, BigInteger, DateTime, ForeignKey, Index
 from database import Base   
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
 
 class Seedbeds(Base):
     __tablename__ = "seedbeds"
+    __table_args__ = (
+        Index("ix_seedbeds_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
 
@@ -29,12 +32,12 @@ class Seedbeds(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
-        default=datetime.now(),
+        default=datetime.now,
         doc="Timestamp when the registration record was created."
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=True,
-        onupdate=datetime.now(),
+        onupdate=datetime.now,
         doc="Timestamp when the registration record was last updated."
     )
@@ -6,6 +6,7 @@ from core.dependencies import CommonDependencies
 from utils.token import get_token
 from fastapi import status
 from .services import SeedbedsService
+from core.pagination import page_count
 from sqlalchemy.exc import IntegrityError
 
 router = APIRouter(
@@ -17,25 +18,29 @@ router = APIRouter(
 
 @router.get("/all", response_model=GetAllSeedbedsResponse)
 async def get_all_journals(
-    page: int = Query(1, ge=1, description="Номер страницы"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы"),
     page_size: int = Query(10, ge=1, le=100, description="Элементов на странице"),
+    include_total: bool = Query(False, description="Посчитать общее количество грядок"),
     commons: CommonDependencies = Depends()
 ):
     db: AsyncSession = commons.db
     seedbeds_service = SeedbedsService(db)
 
     try:
-        journals, total_count = await seedbeds_service.get_all_seedbeds(page, page_size)
-
-        page_count = (total_count + page_size - 1) // page_size
+        journals, next_cursor, total_count = await seedbeds_service.get_all_seedbeds(
+            cursor, page_size, include_total
+        )
         
         return {
             "seedbeds": journals,
-            "page": page,
             "page_size": page_size,
-            "page_count": page_count
+            "next_cursor": next_cursor,
+            "total_count": total_count,
+            "page_count": page_count(total_count, page_size)
         }
     
+    except HTTPException:
+        raise
     except IntegrityError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
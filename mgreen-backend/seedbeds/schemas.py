@@ -40,6 +40,7 @@ class AddSeedbedResponse(BaseModel):
 
 class GetAllSeedbedsResponse(BaseModel):
     seedbeds: List[SeedbedResponse]
-    page: int
     page_size: int
-    page_count: int
\ No newline at end of file
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы, null на последней")
+    total_count: Optional[int] = Field(None, description="Только при include_total=true")
+    page_count: Optional[int] = Field(None, description="Только при include_total=true")
\ No newline at end of file
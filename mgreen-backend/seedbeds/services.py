@@ -1,6 +1,6 @@
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from database import get_db
 from typing import Optional, Tuple, List
@@ -9,6 +9,7 @@ from fastapi import HTTPException
 from plants.models import Plants, PlantsType
 from .schemas import SeedbedResponseFull
 from datetime import datetime
+from core.pagination import encode_cursor, decode_cursor
 
 class SeedbedsService():
     def __init__(self, db: AsyncSession):
@@ -16,21 +17,29 @@ class SeedbedsService():
 
     async def get_all_seedbeds(
         self, 
-        page: int = 1, 
-        page_size: int = 10
-    ) -> List[Seedbeds]:
+        cursor: Optional[str] = None,
+        page_size: int = 10,
+        include_total: bool = False
+    ) -> Tuple[List[dict], Optional[str], Optional[int]]:
         try:
-            offset = (page - 1) * page_size
-            
             query = (
                 select(Seedbeds, Plants.name.label("plant_name"))
                 .join(Plants, Seedbeds.plant_id == Plants.id)
-                .offset(offset)
-                .limit(page_size)
+                .order_by(Seedbeds.created_at.desc(), Seedbeds.id.desc())
+                .limit(page_size + 1)
             )
+
+            after = decode_cursor(cursor, (datetime.fromisoformat, int))
+            if after:
+                query = query.where(tuple_(Seedbeds.created_at, Seedbeds.id) < after)
             
             result = await self.db.execute(query)
             rows = result.all()
+
+            next_cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                next_cursor = encode_cursor([rows[-1][0].created_at, rows[-1][0].id])
             
             seedbeds = []
             for row in rows:
@@ -39,11 +48,13 @@ class SeedbedsService():
                 seedbed_dict['plant_name'] = row[1] 
                 seedbeds.append(seedbed_dict)
             
-            count_query = select(func.count()).select_from(Seedbeds)
-            count_result = await self.db.execute(count_query)
-            total_count = count_result.scalar()
+            total_count = None
+            if include_total:
+                count_query = select(func.count()).select_from(Seedbeds)
+                count_result = await self.db.execute(count_query)
+                total_count = count_result.scalar()
 
-            return seedbeds, total_count
+            return seedbeds, next_cursor, total_count
         
         except SQLAlchemyError as e:
             logging.error(f"Ошибка при получении записей о грядках: {str(e)}")
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+from core.body_limit import body_limit_route
+
+MAX_SIZE = 1024
+received = []
+
+router = APIRouter(route_class=body_limit_route(MAX_SIZE))
+
+
+@router.post("/upload")
+async def upload(photo: UploadFile = File(...)):
+    received.append(photo.filename)
+    return {"size": len(await photo.read())}
+
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+def test_small_upload_passes():
+    response = client.post("/upload", files={"photo": ("a.png", b"x" * 100, "image/png")})
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+
+def test_oversized_content_length_is_rejected_before_parsing():
+    received.clear()
+    response = client.post("/upload", files={"photo": ("a.png", b"x" * (MAX_SIZE * 4), "image/png")})
+    assert response.status_code == 413
+    assert received == []
+
+
+def test_oversized_chunked_body_is_cut_off():
+    received.clear()
+
+    def chunks():
+        yield b"--b\r\nContent-Disposition: form-data; name=\"photo\"; filename=\"a.png\"\r\n\r\n"
+        for _ in range(8):
+            yield b"x" * 512
+        yield b"\r\n--b--\r\n"
+
+    response = client.post(
+        "/upload",
+        content=chunks(),
+        headers={"content-type": "multipart/form-data; boundary=b"}
+    )
+    assert response.status_code == 413
+    assert received == []
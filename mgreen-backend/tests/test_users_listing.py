@@ -0,0 +1,86 @@
+"""
+GET /users/ must cost one query per page, whatever the page size.
+Runs against the database from DATABASE_URL, in a throwaway schema.
+"""
+import asyncio
+import uuid
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+try:
+    from core.config import settings
+    from users.models import Users, UserType
+    from users.services import UserService
+except Exception as e:  # settings need DATABASE_URL, SECRET_KEY etc. from the environment
+    pytest.skip(f"backend not configured: {e}", allow_module_level=True)
+
+USERS = 25
+PAGE_SIZE = 10
+
+
+async def _list_all_pages():
+    schema = f"test_users_{uuid.uuid4().hex[:8]}"
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        connect_args={"server_settings": {"search_path": schema}}
+    )
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+            await conn.run_sync(
+                lambda sync_conn: UserType.metadata.create_all(
+                    sync_conn, tables=[UserType.__table__, Users.__table__]
+                )
+            )
+    except (OSError, DBAPIError) as e:
+        await engine.dispose()
+        pytest.skip(f"database not available: {e}")
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            admin, user = UserType(user_type="admin"), UserType(user_type="user")
+            db.add_all([admin, user])
+            db.add_all([
+                Users(
+                    email=f"user{n}@example.com",
+                    username=f"user{n}",
+                    password="x",
+                    user_type=admin if n % 2 else user
+                )
+                for n in range(USERS)
+            ])
+            await db.commit()
+
+            event.listen(engine.sync_engine, "before_cursor_execute", count)
+            service = UserService(db)
+            pages, cursor = [], None
+            while True:
+                statements.clear()
+                users, cursor = await service.get_all_users(cursor, PAGE_SIZE)
+                pages.append((users, len(statements)))
+                if cursor is None:
+                    break
+            event.remove(engine.sync_engine, "before_cursor_execute", count)
+            await db.rollback()
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        await engine.dispose()
+    return pages
+
+
+def test_users_listing_is_one_query_per_page():
+    pages = asyncio.run(_list_all_pages())
+
+    assert [queries for _, queries in pages] == [1, 1, 1]
+    users = [user for page, _ in pages for user in page]
+    assert [len(page) for page, _ in pages] == [10, 10, 5]
+    assert len({user.id for user in users}) == USERS
+    assert {user.user_type for user in users} == {"admin", "user"}
@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Request, HTTPException, Depends
+from fastapi import APIRouter, Request, HTTPException, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from .schemas import *
-from typing import List
+from typing import List, Optional
 from database import get_db
 from utils.token import get_token
 from .services import get_user_service, UserService
 from core.dependencies import CommonDependencies
 from .models import *
 from auth.services import AuthService, get_auth_service
+from auth.identity import Identity
 
 router = APIRouter(
     prefix="/users",
@@ -15,41 +16,30 @@ router = APIRouter(
     dependencies=[Depends(get_token)]
 )
 
-@router.get("/", response_model=List[UserRead])
+@router.get("/", response_model=GetAllUsersResponse)
 async def get_all_users(
-    page: int = 1,
-    limit: int = 10,
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы"),
+    page_size: int = Query(10, ge=1, le=100, description="Элементов на странице"),
     user_service: UserService = Depends(get_user_service),
     commons: CommonDependencies = Depends()
 ):
     """
     ONLY ADMIN AND SUPERADMIN CAN ACCESS THIS ENDPOINT
     """
-    db = commons.db
     auth_service = commons.auth_service
     token = commons.token
 
     current_user = await auth_service.get_current_user(token)
-    current_user_type = await user_service.get_user_type(str(current_user.user_type_id))
     
-    if current_user_type not in ["admin", "superadmin"]:
+    if current_user.user_type not in ["admin", "superadmin"]:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    users = await user_service.get_all_users(page, limit)
-    user_reads = []
-    for user in users:
-        user_type = await user_service.get_user_type(str(user.user_type_id))
-        user_reads.append(
-            UserRead(
-                id=str(user.id),
-                email=user.email,
-                username=user.username,
-                is_active=user.is_active,
-                is_superuser=user.is_superuser,
-                user_type=user_type or "user",
-            )
-        )
-    return user_reads
+    users, next_cursor = await user_service.get_all_users(cursor, page_size)
+    return {
+        "users": users,
+        "page_size": page_size,
+        "next_cursor": next_cursor
+    }
 
 @router.get("/me", response_model=UserRead)
 async def get_me_profile(
@@ -60,21 +50,20 @@ async def get_me_profile(
     auth_service = commons.auth_service
     token = commons.token
     
-    current_user: Users = await auth_service.get_current_user(token)
+    current_user: Identity = await auth_service.get_current_user(token)
     if not current_user:
         raise HTTPException(status_code=401, detail="User not found")
     
-    user_type = await user_service.get_user_type(str(current_user.user_type_id))
-    if not user_type:
+    if not current_user.user_type:
         raise HTTPException(status_code=404, detail="User type not found")
     
     user = UserRead(
-        id=str(current_user.id),
+        id=current_user.id,
         email=current_user.email,
         username=current_user.username,
         is_superuser=current_user.is_superuser,
         is_active=current_user.is_active,
-        user_type=user_type,  
+        user_type=current_user.user_type,  
     )
     return user
 
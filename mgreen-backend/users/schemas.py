@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class UserBase(BaseModel):
     email: str
@@ -20,6 +21,11 @@ class UserRead(UserBase):
     class Config:
         from_attributes = True
 
+class GetAllUsersResponse(BaseModel):
+    users: List[UserRead]
+    page_size: int
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы, null на последней")
+
 class UserTypeBase(BaseModel):
     user_type: str
 
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from .schemas import UserRead
-from typing import List
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import select
 from database import get_db
 from utils.token import get_token
-from .models import Users
+from .models import Users, UserType
+from core.pagination import encode_cursor, decode_cursor
 from sqlalchemy.sql import text
 from auth.services import AuthService, get_auth_service
 
@@ -12,25 +15,43 @@ class UserService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get_all_users(self, page: int = 1, limit: int = 10):
-        offset = (page - 1) * limit
-        result = await self.db.execute(
-            text("SELECT * FROM users LIMIT :limit OFFSET :offset"),
-            {"limit": limit, "offset": offset},
+    async def get_all_users(
+        self,
+        cursor: Optional[str] = None,
+        page_size: int = 10
+    ) -> Tuple[List[UserRead], Optional[str]]:
+        """One page of users with their type names, one query per page."""
+        query = (
+            select(Users, UserType.user_type)
+            .outerjoin(UserType, Users.user_type_id == UserType.id)
+            .order_by(Users.id)
+            .limit(page_size + 1)
         )
-        users = result.fetchall()
-        return [
-            Users(
-                id=user[0],
-                email=user[1],
-                username=user[2],
-                password=user[3],
-                is_active=user[4],
-                is_superuser=user[5],
-                user_type_id=user[6],
+
+        after = decode_cursor(cursor, (UUID,))
+        if after:
+            query = query.where(Users.id > after[0])
+
+        result = await self.db.execute(query)
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor([rows[-1][0].id])
+
+        users = [
+            UserRead(
+                id=str(user.id),
+                email=user.email,
+                username=user.username,
+                is_active=user.is_active,
+                is_superuser=user.is_superuser,
+                user_type=user_type or "user",
             )
-            for user in users
+            for user, user_type in rows
         ]
+        return users, next_cursor
 
     async def get_user_type(self, user_type_id: str):
         result = await self.db.execute(
@@ -0,0 +1,84 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from core.config import settings
+from utils.logger import logger
+
+
+class MemoryCache:
+    """Size-bounded LRU cache with per-entry TTL, local to the process."""
+
+    def __init__(self, namespace: str, ttl: int, max_size: int):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_size = max_size
+        self._items: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        self._items[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._items.pop(key, None)
+
+    async def close(self):
+        self._items.clear()
+
+
+class RedisCache:
+    """Cache shared by all API workers. Values are stored as JSON with a Redis TTL."""
+
+    def __init__(self, namespace: str, ttl: int, url: str):
+        # Imported lazily so the in-memory backend works without redis installed.
+        from redis.asyncio import Redis
+
+        self.namespace = namespace
+        self.ttl = ttl
+        self.client = Redis.from_url(url)
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self.client.get(self._key(key))
+        except Exception as e:
+            logger.error(f"Redis cache get failed for {self.namespace}: {str(e)}")
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        try:
+            await self.client.set(self._key(key), json.dumps(value, default=str), ex=ttl or self.ttl)
+        except Exception as e:
+            logger.error(f"Redis cache set failed for {self.namespace}: {str(e)}")
+
+    async def delete(self, key: str):
+        try:
+            await self.client.delete(self._key(key))
+        except Exception as e:
+            logger.error(f"Redis cache delete failed for {self.namespace}: {str(e)}")
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def create_cache(namespace: str, ttl: int, max_size: int):
+    """Use Redis when REDIS_URL is configured, otherwise an in-process LRU."""
+    if settings.REDIS_URL:
+        return RedisCache(namespace, ttl, settings.REDIS_URL)
+    return MemoryCache(namespace, ttl, max_size)
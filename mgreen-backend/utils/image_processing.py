@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from PIL import Image, ImageOps, UnidentifiedImageError
+from core.config import settings
+from utils.logger import logger
+from utils.metrics import metrics
+
+# Pillow releases the GIL while decoding, resizing and encoding, so a small
+# thread pool keeps this CPU work off the event loop without process overhead.
+image_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_EXECUTOR_WORKERS,
+    thread_name_prefix="image",
+)
+
+_MIME_TYPES = {
+    "JPEG": "image/jpeg",
+    "WEBP": "image/webp",
+}
+
+
+@dataclass
+class PreparedImage:
+    data: bytes
+    mime_type: str
+    detail: str
+    width: int
+    height: int
+    original_size: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_size - len(self.data)
+
+
+def _choose_detail(width: int, height: int) -> str:
+    if settings.VISION_IMAGE_DETAIL != "auto":
+        return settings.VISION_IMAGE_DETAIL
+    if max(width, height) <= settings.VISION_IMAGE_LOW_DETAIL_MAX_EDGE:
+        return "low"
+    return "high"
+
+
+def preprocess_image(image: bytes) -> PreparedImage:
+    """
+    Apply EXIF orientation, drop all metadata, downscale to VISION_IMAGE_MAX_EDGE
+    and re-encode as VISION_IMAGE_FORMAT at VISION_IMAGE_QUALITY.
+    """
+    image_format = settings.VISION_IMAGE_FORMAT.upper()
+    if image_format not in _MIME_TYPES:
+        raise ValueError(f"Unsupported vision image format: {settings.VISION_IMAGE_FORMAT}")
+
+    try:
+        with Image.open(io.BytesIO(image)) as img:
+            img = ImageOps.exif_transpose(img)
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+
+            max_edge = settings.VISION_IMAGE_MAX_EDGE
+            img.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+            output = io.BytesIO()
+            if image_format == "JPEG":
+                img.save(output, format="JPEG", quality=settings.VISION_IMAGE_QUALITY, optimize=True)
+            else:
+                img.save(output, format="WEBP", quality=settings.VISION_IMAGE_QUALITY, method=4)
+            width, height = img.size
+    except (UnidentifiedImageError, OSError) as e:
+        raise ValueError(f"Invalid image format: {str(e)}")
+
+    return PreparedImage(
+        data=output.getvalue(),
+        mime_type=_MIME_TYPES[image_format],
+        detail=_choose_detail(width, height),
+        width=width,
+        height=height,
+        original_size=len(image),
+    )
+
+
+async def image_digest(image: bytes) -> str:
+    """SHA-256 of the raw upload, hashed on the image pool; cheap enough to run before preprocessing."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(image_executor, lambda: hashlib.sha256(image).hexdigest())
+
+
+async def prepare_image(image: bytes) -> PreparedImage:
+    """Run `preprocess_image` on the image pool and record how many bytes it saved."""
+    loop = asyncio.get_running_loop()
+    with metrics.timer("image.preprocess"):
+        prepared = await loop.run_in_executor(image_executor, preprocess_image, image)
+
+    metrics.incr("image.bytes_in", prepared.original_size)
+    metrics.incr("image.bytes_out", len(prepared.data))
+    metrics.incr("image.bytes_saved", max(prepared.bytes_saved, 0))
+    logger.info(
+        f"Prepared image {prepared.width}x{prepared.height} ({prepared.detail} detail): "
+        f"{prepared.original_size} -> {len(prepared.data)} bytes, saved {prepared.bytes_saved}"
+    )
+    return prepared
@@ -4,13 +4,12 @@ from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql import text
-from passlib.context import CryptContext
+from utils.password import hash_password
 
 from core.config import settings
 from database import Base
 from users.models import Users, UserType, UserTypeEnum
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 engine = create_async_engine(settings.DATABASE_URL, echo=True)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
@@ -56,7 +55,7 @@ async def init_migration():
         admin_exists = admin_exists_result.fetchone()
 
         if not admin_exists:
-            hashed_password = pwd_context.hash(settings.SUPER_ADMIN_PASSWORD)
+            hashed_password = await hash_password(settings.SUPER_ADMIN_PASSWORD)
             admin_user = Users(
                 id=uuid.uuid4(),
                 email=settings.SUPER_ADMIN_EMAIL,
@@ -1,36 +1,76 @@
 import json
 import asyncio
+from typing import List, Optional
 from aiokafka import AIOKafkaProducer
 from utils.logger import logger
 from core.config import settings
 from datetime import datetime
 
 class KafkaProducer:
-    def __init__(self, topic_name="telegram_messages"):
+    """
+    Long-lived producer shared by the whole process.
+
+    Started and stopped with the application; services get it injected and only
+    call send_message(). Sends are batched by linger_ms and compressed.
+    """
+
+    def __init__(self, topic_name: str = settings.KAFKA_TOPIC):
         self.topic_name = topic_name
-        self.producer = None
+        self.producer: Optional[AIOKafkaProducer] = None
+        self._lock = asyncio.Lock()
     
     async def start(self):
-        """Start the Kafka producer."""
-        logger.info(f"Starting Kafka producer for topic: {self.topic_name}")
-        self.producer = AIOKafkaProducer(
-            bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
-            value_serializer=lambda v: json.dumps(v).encode('utf-8')
-        )
-        await self.producer.start()
-        logger.info(f"Kafka producer started successfully")
+        """Start the Kafka producer. Does nothing if it is already running."""
+        async with self._lock:
+            if self.producer:
+                return
+            logger.info(f"Starting Kafka producer for topic: {self.topic_name}")
+            producer = AIOKafkaProducer(
+                bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
+                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+                linger_ms=settings.KAFKA_LINGER_MS,
+                compression_type=settings.KAFKA_COMPRESSION_TYPE or None,
+                max_batch_size=settings.KAFKA_MAX_BATCH_SIZE,
+                acks=settings.KAFKA_ACKS
+            )
+            try:
+                await producer.start()
+            except Exception:
+                await producer.stop()
+                raise
+            self.producer = producer
+            logger.info(f"Kafka producer started successfully")
     
     async def stop(self):
-        """Stop the Kafka producer."""
-        if self.producer:
-            logger.info("Stopping Kafka producer")
-            await self.producer.stop()
-            logger.info("Kafka producer stopped")
+        """Flush in-flight messages and stop the Kafka producer."""
+        async with self._lock:
+            if self.producer:
+                logger.info("Stopping Kafka producer")
+                try:
+                    await self.producer.flush()
+                finally:
+                    await self.producer.stop()
+                    self.producer = None
+                logger.info("Kafka producer stopped")
+
+    async def health(self) -> dict:
+        """Cheap probe for the healthcheck: refresh cluster metadata with a timeout."""
+        if not self.producer:
+            return {"status": "down", "detail": "producer not started"}
+        try:
+            await asyncio.wait_for(
+                self.producer.client.force_metadata_update(),
+                timeout=settings.KAFKA_HEALTH_TIMEOUT
+            )
+            return {"status": "ok", "brokers": len(self.producer.client.cluster.brokers())}
+        except Exception as e:
+            return {"status": "down", "detail": str(e) or type(e).__name__}
     
     async def send_message(self, telegram_id: str, message: str, deliver_at: datetime = None):
         try:
             if not self.producer:
-                raise ValueError("Producer not started. Call start() first.")
+                # Broker may have been unavailable at startup.
+                await self.start()
             
             msg_data = {
                 "telegram_id": telegram_id,
@@ -47,4 +87,29 @@ class KafkaProducer:
             logger.error(f"Error sending message to Kafka: {str(e)}")
             raise
 
-kafka_producer = KafkaProducer()
\ No newline at end of file
+    async def send_notification(self, telegram_ids: List[int], message: str, deliver_at: datetime = None):
+        """
+        One Kafka message for all recipients of a notification; the telegram
+        consumer expands `telegram_ids` into individual sends.
+        """
+        if not telegram_ids:
+            return
+        try:
+            if not self.producer:
+                await self.start()
+
+            msg_data = {
+                "telegram_ids": list(telegram_ids),
+                "message": message
+            }
+            if deliver_at:
+                msg_data["deliver_at"] = deliver_at.isoformat() + "Z"
+
+            logger.info(f"Sending notification to Kafka for {len(msg_data['telegram_ids'])} recipients")
+            await self.producer.send(self.topic_name, value=msg_data)
+
+        except Exception as e:
+            logger.error(f"Error sending notification to Kafka: {str(e)}")
+            raise
+
+kafka_producer = KafkaProducer()
@@ -0,0 +1,48 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class Metrics:
+    """Process-local counters and latency stats, served on /metrics/."""
+
+    def __init__(self):
+        self.counters = defaultdict(int)
+        self.timings = {}
+
+    def incr(self, name: str, value: int = 1):
+        self.counters[name] += value
+
+    def observe(self, name: str, seconds: float, error: bool = False):
+        stats = self.timings.setdefault(
+            name, {"count": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        )
+        stats["count"] += 1
+        stats["total_seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        if error:
+            stats["errors"] += 1
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, error)
+
+    def snapshot(self) -> dict:
+        timings = {}
+        for name, stats in self.timings.items():
+            timings[name] = {
+                **stats,
+                "avg_seconds": stats["total_seconds"] / stats["count"] if stats["count"] else 0.0,
+            }
+        return {"counters": dict(self.counters), "timings": timings}
+
+
+metrics = Metrics()
@@ -1,18 +1,63 @@
+import asyncio
+import functools
+import io
+from concurrent.futures import ThreadPoolExecutor
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from core.config import settings
+from utils.metrics import metrics
 import uuid
 import mimetypes
 
+class FileTooLargeError(ValueError):
+    pass
+
+
+class _LimitedReader:
+    """File-like wrapper that fails as soon as more than `max_size` bytes are read."""
+
+    def __init__(self, fileobj, max_size):
+        self.fileobj = fileobj
+        self.max_size = max_size
+        self.size = 0
+
+    def read(self, size=-1):
+        chunk = self.fileobj.read(size)
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise FileTooLargeError(f"File size exceeds maximum limit of {self.max_size // 1048576}MB")
+        return chunk
+
+
+# One botocore client (and so one HTTP connection pool) shared by every bucket.
+s3_client = boto3.client(
+    "s3",
+    aws_access_key_id=settings.MINIO_ACCESS_KEY,
+    aws_secret_access_key=settings.MINIO_SECRET_KEY,
+    endpoint_url=settings.MINIO_ENDPOINT,
+    config=Config(max_pool_connections=settings.MINIO_MAX_POOL_CONNECTIONS),
+)
+
+# Bounded pool for the blocking boto3 calls, so storage I/O never runs on the event loop.
+storage_executor = ThreadPoolExecutor(
+    max_workers=settings.MINIO_EXECUTOR_WORKERS,
+    thread_name_prefix="storage",
+)
+
+transfer_config = TransferConfig(
+    multipart_threshold=settings.MINIO_MULTIPART_THRESHOLD,
+    multipart_chunksize=settings.MINIO_MULTIPART_CHUNKSIZE,
+    max_concurrency=settings.MINIO_MULTIPART_CONCURRENCY,
+)
+
+
 class Bucket:
-    def __init__(self, bucket_name):
+    def __init__(self, bucket_name, client=s3_client, executor=storage_executor):
         self.bucket_name = bucket_name
-        self.client = boto3.client(
-            "s3",
-            aws_access_key_id=settings.MINIO_ACCESS_KEY,
-            aws_secret_access_key=settings.MINIO_SECRET_KEY,
-            endpoint_url=settings.MINIO_ENDPOINT,
-        )
+        self.client = client
+        self.executor = executor
         self._create_bucket_if_not_exists()
 
     def _create_bucket_if_not_exists(self):
@@ -21,15 +66,31 @@ class Bucket:
         except ClientError:
             self.client.create_bucket(Bucket=self.bucket_name)
 
-    def upload_data(self, name, data):
-        self.client.put_object(Bucket=self.bucket_name, Key=name, Body=data)
+    async def _run(self, operation, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        with metrics.timer(f"storage.{operation}"):
+            return await loop.run_in_executor(
+                self.executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def upload_data(self, name, data):
+        await self._run(
+            "upload_data",
+            self.client.put_object, Bucket=self.bucket_name, Key=name, Body=data
+        )
+
+    async def upload_file(self, file, file_name, max_size=10485760):  # 10MB limit
+        if len(file) > max_size:
+            raise FileTooLargeError(f"File size exceeds maximum limit of {max_size // 1048576}MB")
+
+        if len(file) >= settings.MINIO_MULTIPART_THRESHOLD:
+            await self.upload_fileobj(io.BytesIO(file), file_name, max_size=max_size)
+            return
 
-    def upload_file(self, file, file_name, max_size=10485760):  # 10MB limit
         try:
-            if len(file) > max_size:
-                raise ValueError("File size exceeds maximum limit of 10MB")
-                
-            self.client.put_object(
+            await self._run(
+                "upload_file",
+                self.client.put_object,
                 Bucket=self.bucket_name,
                 Key=file_name,
                 Body=file,
@@ -38,15 +99,51 @@ class Bucket:
         except ClientError as e:
             raise ValueError(f"Failed to upload file to storage: {str(e)}")
 
-    def download_file(self, file_name):
-        self.client.download_file(self.bucket_name, file_name, file_name)
+    async def upload_fileobj(self, fileobj, file_name, content_type=None, max_size=10485760):
+        """
+        Stream a file-like object to storage, enforcing `max_size` while reading.
+        Objects above MINIO_MULTIPART_THRESHOLD go up as a multipart upload with
+        MINIO_MULTIPART_CONCURRENCY parts in flight.
+        """
+        extra_args = {'ACL': 'public-read'}
+        if content_type:
+            extra_args['ContentType'] = content_type
+        try:
+            await self._run(
+                "upload_fileobj",
+                self.client.upload_fileobj,
+                _LimitedReader(fileobj, max_size),
+                self.bucket_name,
+                file_name,
+                ExtraArgs=extra_args,
+                Config=transfer_config
+            )
+        except ClientError as e:
+            raise ValueError(f"Failed to upload file to storage: {str(e)}")
+
+    async def get_file(self, file_name):
+        def _get():
+            response = self.client.get_object(Bucket=self.bucket_name, Key=file_name)
+            return response["Body"].read()
+
+        return await self._run("get_file", _get)
 
-    def delete_file(self, file_name):
-        self.client.delete_object(Bucket=self.bucket_name, Key=file_name)
+    async def download_file(self, file_name):
+        await self._run(
+            "download_file",
+            self.client.download_file, self.bucket_name, file_name, file_name,
+            Config=transfer_config
+        )
+
+    async def delete_file(self, file_name):
+        await self._run(
+            "delete_file",
+            self.client.delete_object, Bucket=self.bucket_name, Key=file_name
+        )
 
     def get_file_url(self, file_name):
         return f"http://194.110.54.189:9000/{self.bucket_name}/{file_name}"
 
 
 bucket_images = Bucket("images")
-bucket_videos = Bucket("videos")
\ No newline at end of file
+bucket_videos = Bucket("videos")
@@ -0,0 +1,53 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from core.config import settings
+from utils.metrics import metrics
+
+# One context per process; bcrypt cost is configurable (each +1 doubles the work).
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL while hashing, so threads give real parallelism here
+# and keep the 100-300 ms of CPU per call off the event loop.
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password",
+)
+
+_pending = 0
+
+
+async def _run(operation: str, func, *args):
+    """
+    Run a hashing call in the bounded pool. When more than
+    PASSWORD_HASH_MAX_PENDING calls are already queued or running, reject
+    right away with 503 instead of letting a login flood pile up.
+    """
+    global _pending
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        metrics.incr("password.rejected")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, try again later",
+            headers={"Retry-After": "1"},
+        )
+
+    _pending += 1
+    try:
+        with metrics.timer(f"password.{operation}"):
+            return await asyncio.get_running_loop().run_in_executor(password_executor, func, *args)
+    finally:
+        _pending -= 1
+
+
+async def hash_password(password: str) -> str:
+    return await _run("hash", pwd_context.hash, password)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await _run("verify", pwd_context.verify, password, hashed_password)
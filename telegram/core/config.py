@@ -3,15 +3,44 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 import os
 from dotenv import load_dotenv
 import hashlib
+from typing import Optional
 
 load_dotenv()
 
 class Settings(BaseSettings):
     BOT_TOKEN: str
+
+    # "webhook" in production, "polling" as a fallback for development
+    BOT_MODE: str = "polling"
+    # Public base URL Telegram calls, e.g. https://bot.example.com
+    WEBHOOK_URL: Optional[str] = None
+    WEBHOOK_PATH: str = "/telegram/webhook"
+    WEBHOOK_SECRET: Optional[str] = None
+    WEBHOOK_MAX_CONCURRENCY: int = 20
     
     KAFKA_BOOTSTRAP_SERVERS: str = "192.168.11.11:9092"  
     KAFKA_GROUP_ID: str = "telegram_bot_group"
     KAFKA_TOPIC: str = "telegram_messages"
+    KAFKA_RETRY_TOPIC: str = "telegram_messages.retry"
+    KAFKA_DLQ_TOPIC: str = "telegram_messages.dlq"
+    KAFKA_MAX_RECORDS: int = 100
+    KAFKA_POLL_TIMEOUT_MS: int = 1000
+
+    # Delivery attempts before a message goes to the dead-letter topic
+    MESSAGE_MAX_ATTEMPTS: int = 5
+    RETRY_BACKOFF_BASE_SECONDS: float = 5.0
+    RETRY_BACKOFF_MAX_SECONDS: float = 600.0
+
+    # Telegram limits: ~30 msg/s per bot, ~1 msg/s per chat
+    TELEGRAM_GLOBAL_RATE: float = 30.0
+    TELEGRAM_CHAT_RATE: float = 1.0
+    TELEGRAM_SENDER_WORKERS: int = 10
+    TELEGRAM_SEND_MAX_RETRIES: int = 3
+
+    # Local store for messages waiting for their deliver_at
+    SCHEDULER_DB_PATH: str = "scheduled_messages.sqlite3"
+    # Messages due sooner than this are sent right away instead of scheduled
+    SCHEDULER_MIN_DELAY_SECONDS: float = 1.0
 
     ADMINS: list[int] = [7258936037]
     
@@ -1,83 +1,188 @@
 import json
 import asyncio
-from aiokafka import AIOKafkaConsumer
-from bot import bot, logger
+from aiokafka import AIOKafkaConsumer, AIOKafkaProducer, TopicPartition
+from pydantic import ValidationError
+from bot import logger
+from scheduler import DeliveryScheduler
+from sender import telegram_sender
 from core.config import settings
-from datetime import datetime, timezone
+from schemas.message import KafkaNotification
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+
+def _deserialize(value: bytes):
+    try:
+        return json.loads(value.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        return {"_invalid": value.decode('utf-8', errors='replace')}
+
 
 class KafkaConsumer:
-    def __init__(self, topic_name="telegram_messages"):
+    """
+    Batch consumer for notification messages.
+
+    Polls with getmany(), handles every message of a batch concurrently and
+    commits each partition only once all of its messages were delivered,
+    durably scheduled or handed over to the retry/dead-letter topic. Failed
+    recipients are republished to the retry topic with exponential backoff
+    (the deliver_at of the retry message, held by the scheduler); after
+    MESSAGE_MAX_ATTEMPTS they go to the dead-letter topic.
+    """
+
+    def __init__(self, topic_name: str = settings.KAFKA_TOPIC):
         self.topic_name = topic_name
-        self.consumer = None
+        self.consumer: Optional[AIOKafkaConsumer] = None
+        self.producer: Optional[AIOKafkaProducer] = None
         self.running = False
+        self.scheduler = DeliveryScheduler(on_due=self.deliver)
     
     async def start(self):
-        """Start the Kafka consumer."""
-        logger.info(f"Starting Kafka consumer for topic: {self.topic_name}")
+        """Start the Kafka consumer, the producer for retries and the scheduler."""
+        logger.info(f"Starting Kafka consumer for topics: {self.topic_name}, {settings.KAFKA_RETRY_TOPIC}")
+        await self.scheduler.start()
+        self.producer = AIOKafkaProducer(
+            bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
+            value_serializer=lambda v: json.dumps(v).encode('utf-8')
+        )
+        await self.producer.start()
         self.consumer = AIOKafkaConsumer(
             self.topic_name,
+            settings.KAFKA_RETRY_TOPIC,
             bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
             group_id=settings.KAFKA_GROUP_ID,
-            value_deserializer=lambda m: json.loads(m.decode('utf-8')),
+            value_deserializer=_deserialize,
             auto_offset_reset='earliest',  
-            enable_auto_commit=True
+            # Offsets are committed per partition after the whole batch was handled.
+            enable_auto_commit=False
         )
         await self.consumer.start()
         self.running = True
         logger.info(f"Kafka consumer started successfully")
-        
-        asyncio.create_task(self.process_messages())
     
     async def stop(self):
-        """Stop the Kafka consumer."""
-        if self.consumer and self.running:
-            logger.info("Stopping Kafka consumer")
-            self.running = False
+        """Stop the Kafka consumer. The consume loop must already be cancelled."""
+        self.running = False
+        logger.info("Stopping Kafka consumer")
+        if self.consumer:
             await self.consumer.stop()
-            logger.info("Kafka consumer stopped")
-    
-    async def process_messages(self):
+            self.consumer = None
+        if self.producer:
+            await self.producer.stop()
+            self.producer = None
+        await self.scheduler.stop()
+        logger.info("Kafka consumer stopped")
+
+    async def run(self):
+        """Supervised entry point: (re)start the clients if needed, then consume."""
+        if not self.running:
+            try:
+                await self.start()
+            except Exception:
+                await self.stop()
+                raise
+        await self.process_messages()
+
+    async def _send_one(self, telegram_id: int, message: str) -> Optional[str]:
+        """Returns the error text, or None when the message was delivered."""
         try:
-            async for msg in self.consumer:
-                try:
-                    data = msg.value
-                    if isinstance(data, dict):
-                        data = [data]
-                    
-                    for item in data:
-                        if 'telegram_id' not in item or 'message' not in item:
-                            logger.warning(f"Invalid message format: {item}")
-                            continue
-                        
-                        deliver_at = item.get('deliver_at')
-                        if deliver_at:
-                            try:
-                                if deliver_at.endswith('Z'):
-                                    deliver_at = deliver_at[:-1] 
-                                deliver_time = datetime.fromisoformat(deliver_at)
-                                now = datetime.now(timezone.utc)
-                                delay_seconds = (deliver_time - now).total_seconds()
-                                logger.info(f"Msg: {item['message'][:50]}..., deliver_at: {deliver_at}, now: {now.isoformat()}Z, delay: {delay_seconds}s")
-                                if delay_seconds > 0:
-                                    logger.info(f"Delaying by {delay_seconds}s until {deliver_time}")
-                                    await asyncio.sleep(delay_seconds)
-                                elif delay_seconds < -10:
-                                    logger.warning(f"Overdue by {-delay_seconds}s, sending anyway: {item['message'][:50]}...")
-                                else:
-                                    logger.info(f"Ready or slightly late ({delay_seconds}s), sending now")
-                            except ValueError as e:
-                                logger.error(f"Invalid deliver_at format: {deliver_at}, error: {str(e)}")
-                                continue
-                        
-                        logger.info(f"Sending to Telegram ID: {item['telegram_id']}")
-                        await bot.send_message(item['telegram_id'], item['message'])
-                        await asyncio.sleep(0.1)
-                except Exception as e:
-                    logger.error(f"Error processing Kafka msg: {str(e)}")
+            logger.info(f"Sending to Telegram ID: {telegram_id}")
+            await telegram_sender.send(telegram_id, message)
+            return None
         except Exception as e:
-            logger.error(f"Error in Kafka consumer: {str(e)}")
-            if self.running:
-                await asyncio.sleep(5)
-                asyncio.create_task(self.process_messages())
+            logger.error(f"Error sending message to {telegram_id}: {str(e)}")
+            return str(e) or type(e).__name__
+
+    async def fan_out(self, recipients: List[int], message: str) -> Dict[int, str]:
+        """Send one message to many recipients; returns the failed ones with their errors."""
+        errors = await asyncio.gather(*(self._send_one(telegram_id, message) for telegram_id in recipients))
+        return {telegram_id: error for telegram_id, error in zip(recipients, errors) if error}
+
+    async def deliver(self, recipients: List[int], message: str, attempt: int = 0):
+        """Send now and hand failed recipients over to the retry or dead-letter topic."""
+        failed = await self.fan_out(recipients, message)
+        if not failed:
+            return
+
+        attempt += 1
+        if attempt >= settings.MESSAGE_MAX_ATTEMPTS:
+            logger.error(f"Giving up on {len(failed)} recipients after {attempt} attempts")
+            await self.producer.send_and_wait(settings.KAFKA_DLQ_TOPIC, {
+                "telegram_ids": list(failed),
+                "message": message,
+                "attempt": attempt,
+                "errors": {str(telegram_id): error for telegram_id, error in failed.items()},
+            })
+            return
+
+        backoff = min(
+            settings.RETRY_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1),
+            settings.RETRY_BACKOFF_MAX_SECONDS
+        )
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=backoff)
+        logger.warning(f"Retrying {len(failed)} recipients in {backoff}s (attempt {attempt})")
+        await self.producer.send_and_wait(settings.KAFKA_RETRY_TOPIC, {
+            "telegram_ids": list(failed),
+            "message": message,
+            "attempt": attempt,
+            "deliver_at": retry_at.isoformat(),
+        })
+
+    async def handle(self, data):
+        items = data if isinstance(data, list) else [data]
+        for item in items:
+            try:
+                notification = KafkaNotification.model_validate(item)
+            except ValidationError as e:
+                # Malformed items would fail again on every replay; park them instead.
+                logger.warning(f"Invalid message format, sending to dead-letter topic: {item}, error: {str(e)}")
+                await self.producer.send_and_wait(settings.KAFKA_DLQ_TOPIC, {"invalid": item})
+                continue
+
+            deliver_time = notification.deliver_at
+            if deliver_time:
+                delay_seconds = (deliver_time - datetime.now(timezone.utc)).total_seconds()
+                if delay_seconds > settings.SCHEDULER_MIN_DELAY_SECONDS:
+                    await self.scheduler.schedule(
+                        deliver_time, notification.recipients, notification.message, notification.attempt
+                    )
+                    continue
+                if delay_seconds < -10:
+                    logger.warning(f"Overdue by {-delay_seconds}s, sending anyway: {notification.message[:50]}...")
+
+            await self.deliver(notification.recipients, notification.message, notification.attempt)
+
+    async def _process_partition(self, tp: TopicPartition, messages) -> bool:
+        results = await asyncio.gather(*(self.handle(msg.value) for msg in messages), return_exceptions=True)
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            # Nothing of this partition is committed; replay the batch from its start.
+            logger.error(f"Failed to hand off {len(failures)} messages of {tp}: {str(failures[0])}")
+            self.consumer.seek(tp, messages[0].offset)
+            return False
+        return True
+
+    async def process_messages(self):
+        """Consume until cancelled; errors propagate to the task supervisor."""
+        while self.running:
+            batches = await self.consumer.getmany(
+                timeout_ms=settings.KAFKA_POLL_TIMEOUT_MS,
+                max_records=settings.KAFKA_MAX_RECORDS
+            )
+            if not batches:
+                continue
+
+            partitions = list(batches.items())
+            handled = await asyncio.gather(
+                *(self._process_partition(tp, messages) for tp, messages in partitions)
+            )
+            offsets = {
+                tp: messages[-1].offset + 1
+                for (tp, messages), ok in zip(partitions, handled) if ok
+            }
+            if offsets:
+                await self.consumer.commit(offsets)
+            if not all(handled):
+                await asyncio.sleep(settings.RETRY_BACKOFF_BASE_SECONDS)
 
-kafka_consumer = KafkaConsumer()
\ No newline at end of file
+kafka_consumer = KafkaConsumer()
@@ -1,47 +1,61 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import uvicorn
-import asyncio
-import threading
 from bot import bot, logger
 from kafka_client import kafka_consumer
+from sender import telegram_sender
+from tasks import supervisor
+from routers import bot_updates
 from core.config import settings
 
+
 async def run_bot_polling():
     logger.info("Starting Telegram bot polling")
     await bot.polling(non_stop=True)
 
-def run_bot():
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
-    try:
-        loop.run_until_complete(asyncio.gather(
-            run_bot_polling(),
-            kafka_consumer.start()
-        ))
-    except Exception as e:
-        logger.error(f"Error in bot thread: {str(e)}")
-    finally:
-        loop.close()
-
-app = FastAPI()
-
-@app.on_event("startup")
-async def startup_event():
-    logger.info("Starting Telegram bot and Kafka consumer in a separate thread")
-    bot_thread = threading.Thread(target=run_bot)
-    bot_thread.daemon = True  
-    bot_thread.start()
-    logger.info("Bot thread started")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("Shutting down Kafka consumer")
+
+async def setup_webhook():
+    if not settings.WEBHOOK_URL:
+        raise RuntimeError("WEBHOOK_URL is required when BOT_MODE=webhook")
+    if not settings.WEBHOOK_SECRET:
+        raise RuntimeError("WEBHOOK_SECRET is required when BOT_MODE=webhook")
+    url = settings.WEBHOOK_URL.rstrip("/") + settings.WEBHOOK_PATH
+    await bot.set_webhook(
+        url=url,
+        secret_token=settings.WEBHOOK_SECRET,
+        max_connections=settings.WEBHOOK_MAX_CONCURRENCY
+    )
+    logger.info(f"Telegram webhook set to {url}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The bot, the Kafka consumer and the HTTP app share this one loop.
+    await telegram_sender.start()
+    if settings.BOT_MODE == "webhook":
+        await setup_webhook()
+    else:
+        await bot.remove_webhook()
+        supervisor.spawn("bot-polling", run_bot_polling)
+    supervisor.spawn("kafka-consumer", kafka_consumer.run)
+    logger.info(f"Telegram bot ({settings.BOT_MODE}) and Kafka consumer started")
+    yield
+    logger.info("Shutting down Telegram bot and Kafka consumer")
+    await supervisor.stop()
+    await bot_updates.drain()
     await kafka_consumer.stop()
+    await telegram_sender.stop()
+    await bot.close_session()
+
+
+app = FastAPI(lifespan=lifespan)
+
+if settings.BOT_MODE == "webhook":
+    app.include_router(bot_updates.router)
 
 @app.get("/")
 async def root():
-    return {"status": "running"}
+    return {"status": "running", "tasks": {name: not task.done() for name, task in supervisor.tasks.items()}}
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8005)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8005, loop="uvloop")
@@ -0,0 +1,54 @@
+import asyncio
+import hmac
+from typing import Optional, Set
+from fastapi import APIRouter, Header, HTTPException, Request, status
+from telebot import types
+from bot import bot, logger
+from core.config import settings
+
+router = APIRouter()
+
+_slots = asyncio.Semaphore(settings.WEBHOOK_MAX_CONCURRENCY)
+_in_flight: Set[asyncio.Task] = set()
+
+
+async def _process(update: types.Update):
+    try:
+        await bot.process_new_updates([update])
+    except Exception as e:
+        logger.error(f"Error processing update {update.update_id}: {str(e)}", exc_info=True)
+    finally:
+        _slots.release()
+
+
+@router.post(settings.WEBHOOK_PATH, include_in_schema=False)
+async def receive_update(
+    request: Request,
+    x_telegram_bot_api_secret_token: Optional[str] = Header(None)
+):
+    """
+    Telegram webhook. Updates are acknowledged right away and handled in the
+    background by the same handlers as in polling mode; at most
+    WEBHOOK_MAX_CONCURRENCY at a time, further requests wait for a free slot.
+    """
+    if not settings.WEBHOOK_SECRET or not hmac.compare_digest(
+        x_telegram_bot_api_secret_token or "", settings.WEBHOOK_SECRET
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid secret token")
+
+    try:
+        update = types.Update.de_json((await request.body()).decode('utf-8'))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid update: {str(e)}")
+
+    await _slots.acquire()
+    task = asyncio.create_task(_process(update))
+    _in_flight.add(task)
+    task.add_done_callback(_in_flight.discard)
+    return {"ok": True}
+
+
+async def drain():
+    """Wait for updates that are still being handled (called on shutdown)."""
+    if _in_flight:
+        await asyncio.gather(*_in_flight, return_exceptions=True)
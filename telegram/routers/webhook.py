@@ -2,7 +2,8 @@ from schemas.message import MessageItem
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from typing import List
 import asyncio
-from bot import bot, logger
+from bot import logger
+from sender import telegram_sender
 
 router = APIRouter()
 
@@ -25,11 +26,12 @@ async def process_webhook(message_batch: List[MessageItem], background_tasks: Ba
     
     return {"status": "processing", "message": f"Processing {len(message_batch)} messages"}
 
+async def _send(item: MessageItem):
+    try:
+        logger.info(f"Sending message to Telegram ID: {item.telegram_id}")
+        await telegram_sender.send(item.telegram_id, item.message)
+    except Exception as e:
+        logger.error(f"Error sending message to {item.telegram_id}: {str(e)}")
+
 async def process_messages(message_batch: List[MessageItem]):
-    for item in message_batch:
-        try:
-            logger.info(f"Sending message to Telegram ID: {item.telegram_id}")
-            await bot.send_message(item.telegram_id, item.message)
-            await asyncio.sleep(0.1)
-        except Exception as e:
-            logger.error(f"Error sending message to {item.telegram_id}: {str(e)}")
\ No newline at end of file
+    await asyncio.gather(*(_send(item) for item in message_batch))
\ No newline at end of file
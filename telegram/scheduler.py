@@ -0,0 +1,141 @@
+import asyncio
+import heapq
+import json
+import sqlite3
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from bot import logger
+from core.config import settings
+
+DueHandler = Callable[[List[int], str, int], Awaitable[None]]
+
+
+class DeliveryScheduler:
+    """
+    Holds future-dated messages off the Kafka consume loop.
+
+    Items are written to a local SQLite file before schedule() returns, so the
+    consumer can commit the Kafka offset afterwards and a restart reloads
+    everything still pending. An in-memory heap keeps the next due item on top;
+    one timer task sleeps until it is due and hands it to `on_due`. A row is
+    deleted only after `on_due` finished, so delivery is at-least-once; if
+    `on_due` raises, the item is put back with exponential backoff.
+    """
+
+    def __init__(self, on_due: DueHandler, path: str = settings.SCHEDULER_DB_PATH):
+        self.on_due = on_due
+        self.path = path
+        self.db: Optional[sqlite3.Connection] = None
+        self.heap: List[Tuple[float, int, List[int], str, int]] = []
+        self.wakeup: Optional[asyncio.Event] = None
+        self.task: Optional[asyncio.Task] = None
+        self.in_flight: Set[asyncio.Task] = set()
+        self.failures: Dict[int, int] = {}
+
+    def _open(self):
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=FULL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS pending ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, deliver_at REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        db.commit()
+        return db
+
+    async def start(self):
+        self.db = await asyncio.to_thread(self._open)
+        rows = await asyncio.to_thread(
+            lambda: self.db.execute("SELECT id, deliver_at, payload FROM pending").fetchall()
+        )
+        # The database is the source of truth; rebuild the heap so a restart does not duplicate items.
+        self.heap = []
+        self.failures = {}
+        for row_id, deliver_at, payload in rows:
+            data = json.loads(payload)
+            heapq.heappush(
+                self.heap, (deliver_at, row_id, data["recipients"], data["message"], data.get("attempt", 0))
+            )
+        self.wakeup = asyncio.Event()
+        self.task = asyncio.create_task(self._run(), name="telegram-delivery-scheduler")
+        logger.info(f"Delivery scheduler started with {len(self.heap)} pending items")
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        if self.in_flight:
+            await asyncio.gather(*self.in_flight, return_exceptions=True)
+        if self.db:
+            self.db.close()
+            self.db = None
+
+    @property
+    def pending(self) -> int:
+        return len(self.heap)
+
+    def _insert(self, deliver_at: float, recipients: List[int], message: str, attempt: int) -> int:
+        cursor = self.db.execute(
+            "INSERT INTO pending (deliver_at, payload) VALUES (?, ?)",
+            (deliver_at, json.dumps({"recipients": recipients, "message": message, "attempt": attempt}))
+        )
+        self.db.commit()
+        return cursor.lastrowid
+
+    def _reschedule(self, row_id: int, deliver_at: float):
+        self.db.execute("UPDATE pending SET deliver_at = ? WHERE id = ?", (deliver_at, row_id))
+        self.db.commit()
+
+    def _delete(self, row_id: int):
+        self.db.execute("DELETE FROM pending WHERE id = ?", (row_id,))
+        self.db.commit()
+
+    async def schedule(self, deliver_at: datetime, recipients: List[int], message: str, attempt: int = 0):
+        """Persist the item; returns once it is durable."""
+        timestamp = deliver_at.timestamp()
+        row_id = await asyncio.to_thread(self._insert, timestamp, recipients, message, attempt)
+        heapq.heappush(self.heap, (timestamp, row_id, recipients, message, attempt))
+        self.wakeup.set()
+        logger.info(f"Scheduled message for {len(recipients)} recipients at {deliver_at.isoformat()}")
+
+    async def _deliver(self, row_id: int, recipients: List[int], message: str, attempt: int):
+        try:
+            await self.on_due(recipients, message, attempt)
+            await asyncio.to_thread(self._delete, row_id)
+            self.failures.pop(row_id, None)
+        except Exception as e:
+            failures = self.failures[row_id] = self.failures.get(row_id, 0) + 1
+            backoff = min(
+                settings.RETRY_BACKOFF_BASE_SECONDS * 2 ** (failures - 1),
+                settings.RETRY_BACKOFF_MAX_SECONDS
+            )
+            logger.error(f"Scheduled delivery {row_id} failed, retrying in {backoff}s: {str(e)}")
+            retry_at = datetime.now(timezone.utc).timestamp() + backoff
+            try:
+                await asyncio.to_thread(self._reschedule, row_id, retry_at)
+            except Exception as db_error:
+                # The row keeps its old deliver_at; it is still retried below and after a restart.
+                logger.error(f"Could not persist retry of scheduled delivery {row_id}: {str(db_error)}")
+            heapq.heappush(self.heap, (retry_at, row_id, recipients, message, attempt))
+            self.wakeup.set()
+
+    async def _run(self):
+        while True:
+            self.wakeup.clear()
+            if not self.heap:
+                await self.wakeup.wait()
+                continue
+
+            delay = self.heap[0][0] - datetime.now(timezone.utc).timestamp()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, row_id, recipients, message, attempt = heapq.heappop(self.heap)
+            task = asyncio.create_task(self._deliver(row_id, recipients, message, attempt))
+            self.in_flight.add(task)
+            task.add_done_callback(self.in_flight.discard)
@@ -1,10 +1,51 @@
-
-from pydantic import BaseModel
-from typing import List
+from datetime import datetime, timezone
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Optional
 
 class MessageItem(BaseModel):
     telegram_id: int
     message: str
 
 class MessageBatch(BaseModel):
-    messages: List[MessageItem]
\ No newline at end of file
+    messages: List[MessageItem]
+
+class KafkaNotification(BaseModel):
+    """A notification item from Kafka: {"telegram_id": ...} or {"telegram_ids": [...]}."""
+    telegram_id: Optional[int] = None
+    telegram_ids: Optional[List[int]] = None
+    message: str
+    deliver_at: Optional[datetime] = None
+    attempt: int = Field(0, ge=0)
+
+    @field_validator('deliver_at', mode='before')
+    @classmethod
+    def deliver_at_is_iso_string(cls, value):
+        # Without this, pydantic would take a number as a unix timestamp.
+        if value is not None and not isinstance(value, str):
+            raise ValueError('deliver_at must be an ISO 8601 string')
+        # The backend appends "Z" even to aware timestamps ("...+00:00Z");
+        # a bare "Z" is UTC anyway, which is also what naive values mean here.
+        if value and value.endswith('Z'):
+            value = value[:-1]
+        return value or None
+
+    @field_validator('deliver_at')
+    @classmethod
+    def deliver_at_as_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+    @model_validator(mode='after')
+    def has_recipients(self):
+        if not self.recipients:
+            raise ValueError('telegram_id or telegram_ids is required')
+        return self
+
+    @property
+    def recipients(self) -> List[int]:
+        if self.telegram_ids is not None:
+            return self.telegram_ids
+        if self.telegram_id is not None:
+            return [self.telegram_id]
+        return []
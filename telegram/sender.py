@@ -0,0 +1,197 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from telebot.asyncio_helper import ApiTelegramException
+from bot import bot, logger
+from core.config import settings
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token is available, 0 if one is available now."""
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self._refill(time.monotonic())
+        self.tokens -= 1
+
+    def full_in(self) -> float:
+        """Seconds until the bucket is full again, i.e. forgetting it changes nothing."""
+        now = time.monotonic()
+        self._refill(now)
+        refill = (self.capacity - self.tokens) / self.rate
+        return max(refill, self.blocked_until - now, 0.0)
+
+    def block(self, seconds: float):
+        """Honour a 429 retry_after: no tokens until it has passed."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+_Pending = Tuple[str, asyncio.Future, int]
+
+
+class TelegramSender:
+    """
+    Rate-limited concurrent sender for bot messages.
+
+    Every chat has its own FIFO queue and token bucket (Telegram allows about
+    1 msg/s per chat); a chat is put on the shared ready queue only when its
+    next message may go out, so a throttled chat never blocks the others. A
+    pool of workers takes ready chats and also draws from a global bucket
+    (about 30 msg/s per bot). A 429 pushes the message back to the front of
+    its chat queue and pauses the chat for `retry_after`. A chat's bucket is
+    dropped once it has refilled and the chat has nothing queued, so only
+    recently active chats are kept in memory.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.TELEGRAM_SENDER_WORKERS,
+        global_rate: float = settings.TELEGRAM_GLOBAL_RATE,
+        chat_rate: float = settings.TELEGRAM_CHAT_RATE,
+        max_retries: int = settings.TELEGRAM_SEND_MAX_RETRIES
+    ):
+        self.workers = workers
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_rate = chat_rate
+        self.max_retries = max_retries
+        self.chats: Dict[int, Deque[_Pending]] = {}
+        self.chat_buckets: Dict[int, TokenBucket] = {}
+        self.ready: Optional[asyncio.Queue] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.ready = asyncio.Queue()
+        self.tasks = [
+            asyncio.create_task(self._worker(), name=f"telegram-sender-{n}")
+            for n in range(self.workers)
+        ]
+        logger.info(f"Telegram sender started with {self.workers} workers")
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        for queue in self.chats.values():
+            for _, future, _ in queue:
+                if not future.done():
+                    future.cancel()
+        self.chats.clear()
+        self.chat_buckets.clear()
+
+    async def send(self, chat_id: int, text: str):
+        """Queue a message and wait until it is delivered (or finally failed)."""
+        if self.loop is None:
+            raise RuntimeError("Telegram sender not started. Call start() first.")
+
+        future = self.loop.create_future()
+        queue = self.chats.get(chat_id)
+        if queue is None:
+            queue = self.chats[chat_id] = deque()
+            queue.append((text, future, 0))
+            self._schedule_chat(chat_id)
+        else:
+            queue.append((text, future, 0))
+        return await future
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self.chat_buckets[chat_id] = TokenBucket(self.chat_rate, 1)
+        return bucket
+
+    def _release_chat(self, chat_id: int):
+        self.chats.pop(chat_id, None)
+        self._drop_idle_bucket(chat_id)
+
+    def _drop_idle_bucket(self, chat_id: int):
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None or chat_id in self.chats:
+            return
+        delay = bucket.full_in()
+        if delay > 0:
+            self.loop.call_later(delay, self._drop_idle_bucket, chat_id)
+        else:
+            del self.chat_buckets[chat_id]
+
+    def _schedule_chat(self, chat_id: int):
+        delay = self._chat_bucket(chat_id).delay()
+        if delay > 0:
+            self.loop.call_later(delay, self.ready.put_nowait, chat_id)
+        else:
+            self.ready.put_nowait(chat_id)
+
+    async def _worker(self):
+        while True:
+            chat_id = await self.ready.get()
+            try:
+                await self._send_next(chat_id)
+            except Exception as e:
+                logger.error(f"Telegram sender worker error for chat {chat_id}: {str(e)}", exc_info=True)
+
+    async def _send_next(self, chat_id: int):
+        queue = self.chats.get(chat_id)
+        if not queue:
+            self._release_chat(chat_id)
+            return
+
+        chat_bucket = self._chat_bucket(chat_id)
+        delay = chat_bucket.delay()
+        if delay > 0:
+            # Blocked by a retry_after that arrived after it was queued.
+            self.loop.call_later(delay, self.ready.put_nowait, chat_id)
+            return
+
+        while (delay := self.global_bucket.delay()) > 0:
+            await asyncio.sleep(delay)
+        self.global_bucket.take()
+        chat_bucket.take()
+
+        text, future, attempts = queue.popleft()
+        try:
+            await bot.send_message(chat_id, text)
+            if not future.done():
+                future.set_result(None)
+        except ApiTelegramException as e:
+            retry_after = None
+            if e.error_code == 429:
+                retry_after = (e.result_json or {}).get("parameters", {}).get("retry_after", 1)
+            if retry_after is not None and attempts < self.max_retries:
+                logger.warning(f"Telegram 429 for chat {chat_id}, retrying after {retry_after}s")
+                chat_bucket.block(retry_after)
+                queue.appendleft((text, future, attempts + 1))
+            elif not future.done():
+                future.set_exception(e)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+
+        if queue:
+            self._schedule_chat(chat_id)
+        else:
+            self._release_chat(chat_id)
+
+
+telegram_sender = TelegramSender()
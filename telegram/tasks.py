@@ -0,0 +1,50 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict
+from bot import logger
+
+TaskFactory = Callable[[], Awaitable[None]]
+
+
+class TaskSupervisor:
+    """
+    Runs long-lived coroutines as tasks on the app's loop and restarts them
+    with exponential backoff when they fail or return. The backoff resets once
+    a task stayed up for `stable_after` seconds.
+    """
+
+    def __init__(self, min_backoff: float = 1.0, max_backoff: float = 60.0, stable_after: float = 60.0):
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.stable_after = stable_after
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    def spawn(self, name: str, factory: TaskFactory):
+        self.tasks[name] = asyncio.create_task(self._supervise(name, factory), name=name)
+
+    async def _supervise(self, name: str, factory: TaskFactory):
+        backoff = self.min_backoff
+        while True:
+            started = time.monotonic()
+            try:
+                await factory()
+                logger.warning(f"Task {name} exited, restarting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Task {name} failed: {str(e)}", exc_info=True)
+
+            if time.monotonic() - started >= self.stable_after:
+                backoff = self.min_backoff
+            logger.info(f"Restarting task {name} in {backoff:g}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def stop(self):
+        for task in self.tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        self.tasks.clear()
+
+
+supervisor = TaskSupervisor()
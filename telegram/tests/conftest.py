@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the service modules the same way main.py does, from the service root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
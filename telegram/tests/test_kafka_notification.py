@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from pydantic import ValidationError
+from schemas.message import KafkaNotification
+
+
+def backend_payload(deliver_at: datetime) -> dict:
+    """What mgreen-backend's KafkaProducer.send_notification puts on the topic."""
+    return {
+        "telegram_ids": [1, 2],
+        "message": "hello",
+        "deliver_at": deliver_at.isoformat() + "Z",
+    }
+
+
+def test_backend_payload_with_aware_deliver_at():
+    deliver_at = datetime.now(timezone.utc) + timedelta(seconds=10)
+    notification = KafkaNotification.model_validate(backend_payload(deliver_at))
+    assert notification.deliver_at == deliver_at
+    assert notification.recipients == [1, 2]
+    assert notification.attempt == 0
+
+
+def test_backend_payload_with_naive_deliver_at_is_utc():
+    deliver_at = datetime(2026, 10, 18, 8, 48, 8, 292471)
+    notification = KafkaNotification.model_validate(backend_payload(deliver_at))
+    assert notification.deliver_at == deliver_at.replace(tzinfo=timezone.utc)
+
+
+def test_retry_payload_round_trips():
+    retry_at = datetime.now(timezone.utc)
+    notification = KafkaNotification.model_validate(
+        {"telegram_ids": [3], "message": "m", "attempt": 1, "deliver_at": retry_at.isoformat()}
+    )
+    assert notification.deliver_at == retry_at
+    assert notification.attempt == 1
+
+
+@pytest.mark.parametrize("item", [
+    {"telegram_id": 1, "message": "m", "deliver_at": 123},
+    {"telegram_id": 1, "message": "m", "deliver_at": "garbage"},
+    {"telegram_id": 1, "message": "m", "attempt": "x"},
+    {"telegram_id": 1, "message": "m", "attempt": -1},
+    {"telegram_ids": [], "message": "m"},
+    {"message": "m"},
+    {"_invalid": "not json"},
+    "not an object",
+])
+def test_malformed_items_are_rejected(item):
+    with pytest.raises(ValidationError):
+        KafkaNotification.model_validate(item)
@@ -0,0 +1,41 @@
+import asyncio
+from datetime import datetime, timezone
+import pytest
+
+try:
+    from core.config import settings
+    from scheduler import DeliveryScheduler
+except Exception as e:  # settings need BOT_TOKEN etc. from the environment
+    pytest.skip(f"telegram service not configured: {e}", allow_module_level=True)
+
+
+def test_failed_delivery_is_retried_with_backoff(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "RETRY_BACKOFF_BASE_SECONDS", 0.2)
+    calls = []
+
+    async def on_due(recipients, message, attempt):
+        calls.append(datetime.now(timezone.utc).timestamp())
+        if len(calls) == 1:
+            raise RuntimeError("kafka is down")
+
+    async def run():
+        scheduler = DeliveryScheduler(on_due, path=str(tmp_path / "pending.sqlite3"))
+        await scheduler.start()
+        try:
+            await scheduler.schedule(datetime.now(timezone.utc), [1], "hello")
+            await asyncio.sleep(0.1)
+            assert len(calls) == 1
+            # Still pending, both in memory and on disk, and due later.
+            assert scheduler.pending == 1
+            (deliver_at,), = scheduler.db.execute("SELECT deliver_at FROM pending").fetchall()
+            assert deliver_at > calls[0]
+
+            await asyncio.sleep(0.4)
+            assert len(calls) == 2
+            assert calls[1] - calls[0] >= 0.2
+            assert scheduler.pending == 0
+            assert scheduler.db.execute("SELECT count(*) FROM pending").fetchone() == (0,)
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(run())